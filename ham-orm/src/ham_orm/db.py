@@ -33,6 +33,11 @@ def wrap_session_begin(db: Session, *, close_on_with_exit: bool = True) -> Sessi
         return depth
 
     def _wrapped_begin(*args: Any, **kwargs: Any):
+        # begin_nested() routes through begin(nested=True); a SAVEPOINT is not
+        # a usage-style change, so don't touch tx_via_with/depth for it.
+        if kwargs.get("nested") or (args and args[0]):
+            return original_begin(*args, **kwargs)
+
         class _BeginProxy:
             def __init__(self):
                 self._trans = None  # real SessionTransaction
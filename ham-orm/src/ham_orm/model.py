@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC
+from datetime import datetime, timezone
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+from sqlalchemy import delete as sa_delete, update as sa_update
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import ColumnElement
@@ -68,7 +70,11 @@ class AppBaseModel:
     
     @property
     def has_soft_delete(self) -> bool:
-        return "deleted_at" in self.__table__.columns
+        cls = self.__class__
+        cached = cls.__dict__.get("_has_soft_delete")
+        if cached is None:
+            cached = cls._has_soft_delete = "deleted_at" in self.__table__.columns
+        return cached
     
     @property
     def is_deleted(self) -> bool:
@@ -181,6 +187,28 @@ class AppBaseModel:
         return self._db.begin()
 
     # -------------------- Data population --------------------
+    @classmethod
+    def _compute_populate_allowed(cls, guard_fields, whitelist_fields) -> frozenset:
+        """The populate allow-set for the given guard/whitelist configuration."""
+        allowed = frozenset(c.key for c in inspect(cls).column_attrs)
+        if whitelist_fields:
+            allowed = allowed & frozenset(whitelist_fields)
+        allowed = allowed - frozenset(guard_fields or ())
+        if "id" in cls.__table__.columns:
+            allowed = allowed - {"id"}
+        else:
+            allowed = allowed - {c.name for c in cls.__table__.columns if c.primary_key}
+        return allowed
+
+    @classmethod
+    def _populate_allowed_fields(cls) -> frozenset:
+        """Columns `populate` may assign, computed once per class and cached."""
+        allowed = cls.__dict__.get("_populate_allowed")
+        if allowed is None:
+            allowed = cls._compute_populate_allowed(cls._guard_fields, cls._whitelist_fields)
+            cls._populate_allowed = allowed
+        return allowed
+
     @dualmethod
     def populate(self, data: dict) -> "AppBaseModel":
         self._ensure_ready()
@@ -188,19 +216,12 @@ class AppBaseModel:
         if data is None:
             return self
 
-        mapper = inspect(self.__class__)
-        model_cols = {c.key for c in mapper.column_attrs}
-
-        guard_fields = list(self._guard_fields or [])
-        pk = self._primary_key
-        if pk:
-            guard_fields.append(pk)
-
-        allowed = model_cols
-        if self._whitelist_fields:
-            allowed = allowed & set(self._whitelist_fields)
-        if guard_fields:
-            allowed = allowed - set(guard_fields)
+        # Instance-level guard/whitelist overrides must not hit the class
+        # cache, or per-object mass-assignment protection would be bypassed.
+        if "_guard_fields" in self.__dict__ or "_whitelist_fields" in self.__dict__:
+            allowed = self._compute_populate_allowed(self._guard_fields, self._whitelist_fields)
+        else:
+            allowed = self._populate_allowed_fields()
 
         for k, v in data.items():
             if k in allowed:
@@ -386,10 +407,61 @@ class AppBaseModel:
         return self.after_delete(obj)
     
     @dualmethod
-    @tx_wrap(refresh_on_commit=True, return_self_on_success=False)    
-    def soft_delete(self, by: Optional[int] = None, reason: Optional[str] = None) -> None:
-        from datetime import datetime, timezone
-        if not self.has_soft_delete():
+    def bulk_delete(self, filters: Mapping[str, Any], permanent: bool = False) -> int:
+        """
+        Delete every row matching `filters` with a single statement.
+
+        Bypasses per-row before_*/after_* hooks by design; use `delete`
+        when hooks must run. Returns the number of affected rows.
+        """
+        self._ensure_ready()
+
+        if self.has_soft_delete and not permanent:
+            return self.bulk_soft_delete(filters)
+
+        cls = self.__class__
+        preds = QueryBuilder(self._db, cls)._build_predicates(dict(filters or {}))
+        stmt = sa_delete(cls).where(*preds)
+        result = self._db.execute(stmt, execution_options={"synchronize_session": False})
+
+        if self.is_autocommit_enabled():
+            self._db.commit()
+        return result.rowcount
+
+    @dualmethod
+    def bulk_soft_delete(self, filters: Mapping[str, Any], by: Optional[int] = None,
+                         reason: Optional[str] = None, now: Optional[datetime] = None) -> int:
+        """
+        Soft-delete every row matching `filters` with a single UPDATE.
+
+        Bypasses per-row before_*/after_* hooks by design; use `soft_delete`
+        when hooks must run. Returns the number of affected rows.
+        """
+        self._ensure_ready()
+
+        if not self.has_soft_delete:
+            raise RuntimeError(f"Model {self.__class__.__name__} does not support soft deletion (no deleted_at column)")
+
+        cls = self.__class__
+        values: Dict[str, Any] = {"deleted_at": now or datetime.now(timezone.utc)}
+        if by is not None and "deleted_by" in cls.__table__.columns:
+            values["deleted_by"] = by
+        if reason is not None and "deletion_reason" in cls.__table__.columns:
+            values["deletion_reason"] = reason
+
+        preds = QueryBuilder(self._db, cls)._build_predicates(dict(filters or {}))
+        stmt = sa_update(cls).where(*preds).values(**values)
+        result = self._db.execute(stmt, execution_options={"synchronize_session": False})
+
+        if self.is_autocommit_enabled():
+            self._db.commit()
+        return result.rowcount
+
+    @dualmethod
+    @tx_wrap(refresh_on_commit=True, return_self_on_success=False)
+    def soft_delete(self, by: Optional[int] = None, reason: Optional[str] = None,
+                    now: Optional[datetime] = None) -> None:
+        if not self.has_soft_delete:
             raise RuntimeError(f"Model {self.__class__.__name__} does not support soft deletion (no deleted_at column)")
         
         if self.deleted_at is not None:
@@ -398,7 +470,7 @@ class AppBaseModel:
         if not self.before_soft_delete():
             return
         
-        self.deleted_at = datetime.now(timezone.utc)
+        self.deleted_at = now or datetime.now(timezone.utc)
         if by is not None and hasattr(self, "deleted_by"):
             self.deleted_by = by
         if reason is not None and hasattr(self, "deletion_reason"):
@@ -411,8 +483,7 @@ class AppBaseModel:
     @dualmethod
     @tx_wrap(refresh_on_commit=True, return_self_on_success=False)    
     def restore(self) -> None:
-        from datetime import datetime, timezone
-        if not self.has_soft_delete():
+        if not self.has_soft_delete:
             raise RuntimeError(f"Model {self.__class__.__name__} does not support restore (no deleted_at column)")
         
         if self.deleted_at is None:
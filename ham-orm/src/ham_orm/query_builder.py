@@ -1,22 +1,254 @@
 # query_builder.py
 from __future__ import annotations
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 import re
+import warnings
+from functools import lru_cache
+import sqlalchemy
 from sqlalchemy import and_, or_
 
-#from attr import field
-
-from sqlalchemy.orm import Session, load_only, selectinload, joinedload
+from sqlalchemy.orm import Session, load_only, selectinload, with_loader_criteria
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.sql import ColumnElement
-from sqlalchemy import func, asc, desc, select
-from sqlalchemy.orm import Query
+from sqlalchemy import bindparam, func, asc, desc, select
 
 LoaderOpt = Any
 FilterDict = Dict[str, Any]
 
+# select() + Session.execute() exists (and carries the compiled-statement
+# cache) from SQLAlchemy 1.4 on; only older versions need Session.query().
+_SA_PRE_14 = tuple(int(x) for x in sqlalchemy.__version__.split(".")[:2]) < (1, 4)
+
 _ALIAS_RE = re.compile(r"\s+as\s+", flags=re.IGNORECASE)
 
+
+# Resolution below is pure attribute lookup keyed by (model class, string),
+# both stable for the lifetime of the process, so memoize at module level:
+# repeated query builds against the same endpoint become dict hits.
+
+@lru_cache(maxsize=4096)
+def _split_alias_cached(s: str) -> Tuple[str, Optional[str]]:
+    # Most fields carry no alias; a substring check is far cheaper than the
+    # regex split, and "as" must appear somewhere for an alias to exist.
+    if "as" not in s.lower():
+        return s.strip(), None
+    parts = [p.strip() for p in _ALIAS_RE.split(s)]
+    return (parts[0], parts[1]) if len(parts) == 2 else (s.strip(), None)
+
+
+# Root primary-key column per model; resolution via the mapper is stable for
+# the class, so one inspection per model suffices.
+_PK_CACHE: Dict[type, ColumnElement[Any]] = {}
+
+
+# Full {name: InstrumentedAttribute} map per model, built on first use, so
+# resolving any column of an already-seen model is one dict hit instead of a
+# hasattr/getattr walk through the descriptor protocol.
+_MODEL_ATTRS: Dict[type, Dict[str, InstrumentedAttribute]] = {}
+
+
+@lru_cache(maxsize=4096)
+def _resolve_attr_cached(model: Type[Any], name: str) -> InstrumentedAttribute:
+    attrs = _MODEL_ATTRS.get(model)
+    if attrs is None:
+        attrs = {k: v for k, v in vars(model).items() if isinstance(v, InstrumentedAttribute)}
+        _MODEL_ATTRS[model] = attrs
+    attr = attrs.get(name)
+    if attr is not None:
+        return attr
+    # Not a plain instrumented attribute (hybrid, proxy, inherited) — fall
+    # back to the descriptor protocol.
+    if not hasattr(model, name):
+        raise ValueError(f"{model.__name__} has no attribute '{name}'")
+    return getattr(model, name)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_attr_path_cached(model: Type[Any], path: str, root_model: Type[Any]) -> InstrumentedAttribute:
+    # Depth-1 paths (the common case) skip the loop machinery entirely.
+    if "." not in path:
+        base, _alias = _split_alias_cached(path)
+        prefix = f"{root_model.__name__}."
+        if base.startswith(prefix):
+            base = base[len(prefix):]
+        return _resolve_attr_cached(model, base)
+
+    prefix = f"{root_model.__name__}."
+    resolve = _resolve_attr_cached
+    split_alias = _split_alias_cached
+    current = model
+    attr = None
+    for p in path.split("."):
+        base, _alias = split_alias(p)
+        if base.startswith(prefix):
+            base = base[len(prefix):]
+        attr = resolve(current, base)
+        rel = getattr(attr, "property", None)
+        if rel is not None and hasattr(rel, "mapper"):
+            current = rel.mapper.class_
+        # else: keep current as-is (do NOT reset to model)
+    return attr
+
+
+def _warn_if_joined_collection(opt: LoaderOpt) -> None:
+    """
+    Warn when a caller-supplied joinedload() targets a collection
+    relationship: the join duplicates each parent row per child, and
+    selectinload avoids that with one extra IN-query.
+    """
+    for elem in getattr(opt, "context", ()):
+        if getattr(elem, "strategy", None) != (("lazy", "joined"),):
+            continue
+        for node in getattr(getattr(elem, "path", None), "path", ()):
+            if getattr(node, "uselist", False):
+                warnings.warn(
+                    f"joinedload() on collection relationship '{node.key}' duplicates "
+                    "parent rows per child; prefer selectinload() for collections",
+                    stacklevel=3,
+                )
+                return
+
+
+# Filter-operator dispatch for _build_predicates: O(1) lookup instead of a
+# 13-way elif chain per filter key. Handlers take (col, value, key); key is
+# only used for error messages.
+
+def _op_in(col, value, key):
+    if not isinstance(value, (list, tuple, set)):
+        raise TypeError(f"'{key}' expects a list/tuple/set")
+    return col.in_(list(value))
+
+
+def _op_between(col, value, key):
+    if not (isinstance(value, (list, tuple)) and len(value) == 2):
+        raise TypeError(f"'{key}' expects a 2-tuple/list (low, high)")
+    lo, hi = value
+    return col.between(lo, hi)
+
+
+# Emit index-friendly predicates (equality, IN) before range and LIKE ones;
+# several planners weigh clause order in cost estimation, and it never
+# changes results. Lower sorts first; grouped __or/__and clauses stay last.
+_OP_PRIORITY = {
+    "eq": 0, "isnull": 0, "notnull": 0,
+    "in": 1,
+    "lt": 2, "lte": 2, "gt": 2, "gte": 2,
+    "between": 3,
+    "ne": 4,
+    "like": 5, "ilike": 5,
+    "contains": 6, "icontains": 6,
+    "startswith": 6, "istartswith": 6,
+    "endswith": 6, "iendswith": 6,
+}
+_GROUP_PRIORITY = 7
+
+_OPS = {
+    "eq": lambda col, value, key: col.is_(None) if value is None else (col == value),
+    "ne": lambda col, value, key: col.is_not(None) if value is None else (col != value),
+    "lt": lambda col, value, key: col < value,
+    "lte": lambda col, value, key: col <= value,
+    "gt": lambda col, value, key: col > value,
+    "gte": lambda col, value, key: col >= value,
+    "in": _op_in,
+    "between": _op_between,
+    "like": lambda col, value, key: col.like(value),
+    "ilike": lambda col, value, key: col.ilike(value),
+    "contains": lambda col, value, key: col.like(f"%{value}%"),
+    "icontains": lambda col, value, key: col.ilike(f"%{value}%"),
+    "startswith": lambda col, value, key: col.like(f"{value}%"),
+    "istartswith": lambda col, value, key: col.ilike(f"{value}%"),
+    "endswith": lambda col, value, key: col.like(f"%{value}"),
+    "iendswith": lambda col, value, key: col.ilike(f"%{value}"),
+    "isnull": lambda col, value, key: col.is_(True if value is True else None),
+    "notnull": lambda col, value, key: col.is_not(None),
+}
+
+
+# ---------- build_query plan cache ----------
+# Repeated build_query() calls for the same endpoint redo predicate building,
+# alias parsing and join resolution even though only the filter *values*
+# change. For simple scalar operators we build the select() once with
+# bindparam() placeholders and replay it with a params dict, so different
+# literal values share one cached plan. Anything fancier (None/IS NULL,
+# __in, __between, __or/__and groups, raw expressions) falls back to the
+# normal chain.
+
+# like-family operators rewrite the value into a pattern, so the pattern is
+# applied to the parameter value and the op collapses to like/ilike.
+_PLAN_LIKE_OPS = {
+    "contains": ("like", "%{}%"),
+    "icontains": ("ilike", "%{}%"),
+    "startswith": ("like", "{}%"),
+    "istartswith": ("ilike", "{}%"),
+    "endswith": ("like", "%{}"),
+    "iendswith": ("ilike", "%{}"),
+}
+_PLAN_OPS = ("eq", "ne", "lt", "lte", "gt", "gte", "like", "ilike")
+
+
+def _plan_signature(filters: FilterDict) -> Optional[Tuple[Tuple[Tuple[str, str, str], ...], Dict[str, Any]]]:
+    """
+    Canonicalize `filters` into a hashable ((field, op, param_name), ...)
+    signature plus the {param_name: value} mapping, or None if any entry
+    is not plan-cacheable.
+    """
+    sig = []
+    params: Dict[str, Any] = {}
+    for i, key in enumerate(sorted(filters, key=str)):
+        if not isinstance(key, str) or key in ("__or", "__and"):
+            return None
+        value = filters[key]
+        if "__" in key:
+            field, op = key.split("__", 1)
+        else:
+            field, op = key, "eq"
+        if op in _PLAN_LIKE_OPS:
+            op, pattern = _PLAN_LIKE_OPS[op]
+            value = pattern.format(value)
+        if op not in _PLAN_OPS or value is None:
+            # None flips eq/ne into IS (NOT) NULL, which can't be a bindparam
+            return None
+        pname = f"p{i}"
+        sig.append((field, op, pname))
+        params[pname] = value
+    return tuple(sig), params
+
+
+@lru_cache(maxsize=512)
+def _cached_plan_stmt(model: Type[Any], fields: Tuple[str, ...],
+                      filters_sig: Tuple[Tuple[str, str, str], ...],
+                      orders: Tuple[str, ...], includes: Tuple[str, ...],
+                      has_offset: bool, has_limit: bool):
+    qb = QueryBuilder(None, model, use_legacy_query=False)
+    if fields:
+        qb.only(*fields)
+    for field, op, pname in filters_sig:
+        field = qb._normalize_field(field)
+        if "." in field:
+            rel_path, leaf = field.rsplit(".", 1)
+            rel_attr = qb._resolve_attr_path(model, rel_path)
+            prop = getattr(rel_attr, "property", None)
+            if not prop or not hasattr(prop, "mapper"):
+                raise ValueError(f"'{rel_path}' is not a relationship path on {model.__name__}")
+            col = qb._resolve_attr(prop.mapper.class_, leaf)
+            if not qb._has_join(rel_attr):
+                qb._add_join(rel_attr)
+        else:
+            col = qb._resolve_attr(model, field)
+        # _OPS handlers are value-agnostic for the simple ops admitted by
+        # _plan_signature, so a bindparam slots straight in.
+        qb._filters.append(_OPS[op](col, bindparam(pname), pname))
+    for o in orders:
+        qb.order_by(o)
+    for inc in includes:
+        qb.include(inc)
+    if has_offset:
+        qb._offset = bindparam("offset_")
+    if has_limit:
+        qb._limit = bindparam("limit_")
+    return qb.build()
+
+
 class QueryBuilder:
     """
     Chainable query builder for SQLAlchemy ORM (sync Session).
@@ -31,33 +263,54 @@ class QueryBuilder:
         study = qb.first()
     """
 
-    def __init__(self, db: Session, model: Type[Any]):
-        # Support both legacy and modern SQLAlchemy sessions
+    def __init__(self, db: Session, model: Type[Any], use_legacy_query: Optional[bool] = None):
+        # Support both legacy and modern SQLAlchemy sessions. 1.4/2.0 Sessions
+        # still expose .query, so prefer select()/execute() (which reuses the
+        # compiled-statement cache) unless the installed SQLAlchemy predates it
+        # or the caller forces the legacy path.
         self.db: Session = db
         self.model: Type[Any] = model
-        self._use_legacy_query = hasattr(db, "query")  # Check if legacy query API is available
+        if use_legacy_query is None:
+            use_legacy_query = _SA_PRE_14 and hasattr(db, "query")
+        self._use_legacy_query = use_legacy_query
 
         self._joins: list[tuple[InstrumentedAttribute, bool]] = []   # (attr, isouter)
+        self._joined_ids: set[int] = set()                           # id(attr) of joined rels
         self._includes: List[LoaderOpt] = []                         # loader options
         self._only_cols: List[InstrumentedAttribute] = []            # for load_only
         self._filters: List[ColumnElement[bool]] = []                # where clauses
         self._order_by: List[ColumnElement[Any]] = []
+        self._group_by: List[ColumnElement[Any]] = []
         self._limit: Optional[int] = None
         self._offset: Optional[int] = None
 
+        self._plan_stmt = None                                       # cached select() from build_query
+        self._plan_params: Dict[str, Any] = {}                       # bindparam values for _plan_stmt
+        self._loader_criteria: List[Tuple[Type[Any], ColumnElement[bool]]] = []  # pushed-down rel filters
+
     # ---------- chainable API ----------
+    def _assert_no_plan(self) -> None:
+        """Criteria added after a cached plan would be silently ignored — refuse."""
+        if self._plan_stmt is not None:
+            raise RuntimeError(
+                "QueryBuilder already holds a compiled plan from build_query(); "
+                "chain criteria before build_query() or start a fresh builder"
+            )
+
     def include(self, *rels_or_opts: Union[str, LoaderOpt]) -> "QueryBuilder":
         """
         Eager-load relationships. Accepts:
           - string names: "patient" -> selectinload(Model.patient)
           - loader options: selectinload(Model.patient), joinedload(...), etc.
         """
+        self._assert_no_plan()
         for x in rels_or_opts:
             if isinstance(x, str):
                 attr = self._resolve_attr_path(self.model, x)  # supports "patient" or "patient.studies"
                 self._includes.append(selectinload(attr))
             else:
                 # assume already a loader option
+                _warn_if_joined_collection(x)
                 self._includes.append(x)
         return self
 
@@ -69,6 +322,12 @@ class QueryBuilder:
         - "rel.field" to apply load_only on a relationship
         - Aliases like "field as Alias" (alias ignored at ORM-option time)
         """
+        self._assert_no_plan()
+        # Collect dotted leaves per relation so "patient.id", "patient.name"
+        # emit ONE selectinload(patient).load_only(id, name) instead of one
+        # loader option per field.
+        rel_to_leaves: Dict[InstrumentedAttribute, List[InstrumentedAttribute]] = {}
+
         for c in cols:
             if not isinstance(c, str):
                 self._only_cols.append(c)
@@ -85,10 +344,13 @@ class QueryBuilder:
                     raise ValueError(f"'{rel_path}' is not a relationship path on {self.model.__name__}")
                 target_cls = prop.mapper.class_
                 leaf_attr = self._resolve_attr(target_cls, leaf)  # Patient.id
-                self._includes.append(selectinload(rel_attr).load_only(leaf_attr))
+                rel_to_leaves.setdefault(rel_attr, []).append(leaf_attr)
             else:
                 attr = self._resolve_attr(self.model, base)  # Study.study_date
                 self._only_cols.append(attr)
+
+        for rel_attr, leaves in rel_to_leaves.items():
+            self._includes.append(selectinload(rel_attr).load_only(*leaves))
         return self
     
     def where(self, filters: Optional[FilterDict] = None,
@@ -103,6 +365,7 @@ class QueryBuilder:
                  "patient_email__isnull": True}
           - raw SQLAlchemy boolean expressions as *expressions
         """
+        self._assert_no_plan()
         if filters:
             self._filters.extend(self._build_predicates(filters))
         if expressions:
@@ -113,9 +376,10 @@ class QueryBuilder:
         """
         Join relationships from the root model. Accepts strings like "patient".
         """
+        self._assert_no_plan()
         for r in rels:
             attr = self._resolve_attr_path(self.model, r) if isinstance(r, str) else r
-            self._joins.append((attr, isouter))
+            self._add_join(attr, isouter)
         return self
 
     def order_by(self, *items: Union[str, ColumnElement[Any]]) -> "QueryBuilder":
@@ -127,6 +391,7 @@ class QueryBuilder:
             * if the path is a collection relationship (uselist=True), we aggregate:
             ASC -> MIN(leaf), DESC -> MAX(leaf) and GROUP BY the root PK
         """
+        self._assert_no_plan()
         for it in items:
             if not isinstance(it, str):
                 self._order_by.append(it)
@@ -152,7 +417,7 @@ class QueryBuilder:
 
             # ensure join (inner is fine; change to outer by passing isouter=True if you prefer)
             if not self._has_join(rel_attr):
-                self._joins.append((rel_attr, False))
+                self._add_join(rel_attr)
 
             if getattr(prop, "uselist", False):
                 # collection -> aggregate and group by root PK
@@ -168,10 +433,12 @@ class QueryBuilder:
         return self
 
     def limit(self, n: int) -> "QueryBuilder":
+        self._assert_no_plan()
         self._limit = n
         return self
 
     def offset(self, n: int) -> "QueryBuilder":
+        self._assert_no_plan()
         self._offset = n
         return self
 
@@ -180,42 +447,36 @@ class QueryBuilder:
         """
         Return a SQLAlchemy Query or Result, supporting both legacy and modern APIs.
         """
+        # Query (legacy 1.x) and Select (2.0+) share join/options/order_by/
+        # limit/offset signatures, so build on one code path; only the filter
+        # method name differs.
         if self._use_legacy_query:
-            # Legacy SQLAlchemy 1.x style
             q = self.db.query(self.model)
         else:
-            # Modern SQLAlchemy 2.0+ style
             q = select(self.model)
 
         # joins
-        if self._use_legacy_query:
-            for attr, isouter in self._joins:
-                q = q.join(attr, isouter=isouter)
-        else:
-            for attr, isouter in self._joins:
-                q = q.join(attr, isouter=isouter)
+        for attr, isouter in self._joins:
+            q = q.join(attr, isouter=isouter)
 
         # loader options
         if self._includes:
-            if self._use_legacy_query:
-                q = q.options(*self._includes)
-            else:
-                q = q.options(*self._includes)
-        
+            q = q.options(*self._includes)
+
         if self._only_cols:
-            if self._use_legacy_query:
-                q = q.options(load_only(*self._only_cols))
-            else:
-                q = q.options(load_only(*self._only_cols))
+            q = q.options(load_only(*self._only_cols))
+
+        if self._loader_criteria:
+            q = q.options(*(with_loader_criteria(cls_, crit) for cls_, crit in self._loader_criteria))
 
         # filters
         if self._filters:
-            if self._use_legacy_query:
-                q = q.filter(*self._filters)
-            else:
-                q = q.where(*self._filters)
+            filter_method = q.filter if self._use_legacy_query else q.where
+            q = filter_method(*self._filters)
 
         # order / limit / offset
+        if self._group_by:
+            q = q.group_by(*self._group_by)
         if self._order_by:
             q = q.order_by(*self._order_by)
         if self._limit is not None:
@@ -243,6 +504,30 @@ class QueryBuilder:
         Returns:
             Self for method chaining
         """
+        # The cached plan is built from these kwargs alone, so it is only
+        # safe on a pristine builder — anything already chained would be
+        # silently dropped from the statement.
+        pristine = not (self._filters or self._joins or self._includes
+                        or self._only_cols or self._order_by or self._group_by
+                        or self._loader_criteria
+                        or self._limit is not None or self._offset is not None)
+        if pristine and not self._use_legacy_query and (filters is None or isinstance(filters, dict)) \
+                and all(isinstance(x, str) for x in (*(fields or ()), *(orders or ()), *(includes or ()))):
+            sig = _plan_signature(filters or {})
+            if sig is not None and not self._has_collection_filter(sig[0]):
+                filters_sig, params = sig
+                self._plan_stmt = _cached_plan_stmt(
+                    self.model, tuple(fields or ()), filters_sig,
+                    tuple(orders or ()), tuple(includes or ()),
+                    offset is not None, limit is not None,
+                )
+                if offset is not None:
+                    params["offset_"] = offset
+                if limit is not None:
+                    params["limit_"] = limit
+                self._plan_params = params
+                return self
+
         q = self
 
         if fields:
@@ -265,25 +550,84 @@ class QueryBuilder:
         if limit is not None:
             q = q.limit(limit)
 
-        return q.build()
+        return q
+
+    @classmethod
+    def compile_plan(cls, model: Type[Any], fields: Tuple[str, ...] = (),
+                     filter_spec: Tuple[str, ...] = (), orders: Tuple[str, ...] = (),
+                     includes: Tuple[str, ...] = (), *,
+                     offset: Optional[int] = None, limit: Optional[int] = None):
+        """
+        Precompile a fixed-shape query into a runner closure for hot endpoints.
+
+        filter_spec lists the filter keys ("name", "age__gte", ...); only the
+        simple scalar operators are supported. The select() is built once with
+        bindparam placeholders; the returned callable just binds values and
+        executes:
+
+            run = QueryBuilder.compile_plan(Study, fields=("id",),
+                                            filter_spec=("patient_name__ilike",))
+            rows = run(db, {"patient_name__ilike": "%ali%"})
+        """
+        sig = []
+        converters = []
+        for i, key in enumerate(filter_spec):
+            if "__" in key:
+                field, op = key.split("__", 1)
+            else:
+                field, op = key, "eq"
+            wrap = None
+            if op in _PLAN_LIKE_OPS:
+                op, wrap = _PLAN_LIKE_OPS[op][0], _PLAN_LIKE_OPS[op][1]
+            if op not in _PLAN_OPS:
+                raise ValueError(f"Unsupported operator '__{op}' for compiled plan key '{key}'")
+            pname = f"p{i}"
+            sig.append((field, op, pname))
+            converters.append((key, pname, wrap))
+
+        has_offset = offset is not None
+        has_limit = limit is not None
+        stmt = _cached_plan_stmt(model, tuple(fields or ()), tuple(sig),
+                                 tuple(orders or ()), tuple(includes or ()),
+                                 has_offset, has_limit)
+
+        def run(db: Session, values: Optional[Dict[str, Any]] = None):
+            params: Dict[str, Any] = {}
+            if values:
+                for key, pname, wrap in converters:
+                    v = values[key]
+                    params[pname] = wrap.format(v) if wrap else v
+            if has_offset:
+                params["offset_"] = offset
+            if has_limit:
+                params["limit_"] = limit
+            return db.execute(stmt, params).scalars().all()
+
+        return run
 
     def first(self):
+        if self._plan_stmt is not None:
+            return self.db.execute(self._plan_stmt, self._plan_params).scalars().first()
         q = self.build()
         if self._use_legacy_query:
             return q.first()
         else:
             # Modern SQLAlchemy 2.0+ style
-            return self.db.execute(q).scalar_one_or_none()
+            return self.db.execute(q).scalars().first()
 
     def one_or_none(self):
+        if self._plan_stmt is not None:
+            return self.db.execute(self._plan_stmt, self._plan_params).scalar_one_or_none()
         q = self.build()
         if self._use_legacy_query:
             return q.one_or_none()
         else:
-            # Modern SQLAlchemy 2.0+ style  
+            # Modern SQLAlchemy 2.0+ style
             return self.db.execute(q).scalar_one_or_none()
 
     def all(self):
+        if self._plan_stmt is not None:
+            return self.db.execute(self._plan_stmt, self._plan_params).scalars().all()
         q = self.build()
         if self._use_legacy_query:
             return q.all()
@@ -295,6 +639,14 @@ class QueryBuilder:
         """
         Return row count matching current filters/joins.
         """
+        if self._plan_stmt is not None:
+            # The plan keeps its filters as bindparams inside the compiled
+            # statement, not in self._filters — counting here would silently
+            # ignore them.
+            raise RuntimeError(
+                "count() is not supported on a plan compiled by build_query(); "
+                "use where(...).count() on a fresh builder"
+            )
         if self._use_legacy_query:
             q = self.db.query(func.count()).select_from(self.model)
             if self._filters:
@@ -331,31 +683,18 @@ class QueryBuilder:
         Split strings like 'field as Alias' (case-insensitive).
         Returns (base, alias_or_None).
         """
-        parts = [p.strip() for p in _ALIAS_RE.split(s)]
-        return (parts[0], parts[1]) if len(parts) == 2 else (s.strip(), None)
-    
+        return _split_alias_cached(s)
+
     def _resolve_attr(self, model: Type[Any], name: str) -> InstrumentedAttribute:
         # Strip alias and model prefix before hasattr/getattr
-        base, _alias = self._split_alias(name)
+        base, _alias = _split_alias_cached(name)
         base = self._normalize_field(base)
-        if not hasattr(model, base):
-            raise ValueError(f"{model.__name__} has no attribute '{base}'")
-        return getattr(model, base)
+        return _resolve_attr_cached(model, base)
 
     def _resolve_attr_path(self, model: Type[Any], path: Union[str, InstrumentedAttribute]) -> InstrumentedAttribute:
         if not isinstance(path, str):
             return path
-        current = model
-        parts = path.split(".")
-        attr: Optional[InstrumentedAttribute] = None
-        for p in parts:
-            attr = self._resolve_attr(current, p)
-            rel = getattr(attr, "property", None)
-            if rel is not None and hasattr(rel, "mapper"):
-                current = rel.mapper.class_
-            # else: keep current as-is (do NOT reset to model)
-        assert attr is not None
-        return attr
+        return _resolve_attr_path_cached(model, path, self.model)
      
     def _normalize_field(self, field: str) -> str:
         prefix = f"{self.model.__name__}."
@@ -376,7 +715,7 @@ class QueryBuilder:
         - "__and": value is a list of dicts and/or SQLAlchemy boolean expressions.
                     Each dict is internally AND-combined, then all are AND-combined.
         """
-        preds: List[ColumnElement[bool]] = []
+        tagged: List[Tuple[int, ColumnElement[bool]]] = []  # (priority, pred)
 
         # Helper to convert an object (dict or ColumnElement) into a single predicate
         def _to_single_pred(obj) -> ColumnElement[bool]:
@@ -398,13 +737,17 @@ class QueryBuilder:
                 "__or/__and expects a list of dicts or SQLAlchemy boolean expressions"
             )
 
-        # First pass: pull out grouping keys to allow mixing with normal keys
-        group_ors = data.pop("__or", None) if isinstance(data, dict) else None
-        group_ands = data.pop("__and", None) if isinstance(data, dict) else None
+        # Pull out grouping keys non-destructively so callers can reuse (or
+        # retry with) the same dict; normal keys are filtered in the loop.
+        is_dict = isinstance(data, dict)
+        group_ors = data.get("__or") if is_dict else None
+        group_ands = data.get("__and") if is_dict else None
 
         # Handle normal (non-grouping) keys as before (AND behavior)
-        if isinstance(data, dict):
+        if is_dict:
             for key, value in data.items():
+                if key in ("__or", "__and"):
+                    continue
                 # split field and operator
                 if "__" in key:
                     raw_field, op = key.split("__", 1)
@@ -413,6 +756,7 @@ class QueryBuilder:
 
                 field = self._normalize_field(raw_field)
 
+                pushdown_cls = None
                 if "." in field:
                     rel_path, leaf = field.rsplit(".", 1)
                     rel_attr = self._resolve_attr_path(self.model, rel_path)  # ensures path
@@ -424,64 +768,74 @@ class QueryBuilder:
 
                     # ensure we join to filter on related leaf column
                     if not self._has_join(rel_attr):
-                        self._joins.append((rel_attr, False))
+                        self._add_join(rel_attr)
+                    if getattr(prop, "uselist", False):
+                        pushdown_cls = target_cls
                 else:
                     col = self._resolve_attr(self.model, field)
 
-                # mapping (same as your original)
-                if op == "eq":
-                    preds.append(col.is_(None) if value is None else (col == value))
-                elif op == "ne":
-                    preds.append(col.is_not(None) if value is None else (col != value))
-                elif op in ("lt", "lte", "gt", "gte"):
-                    op_map = {"lt": col < value, "lte": col <= value, "gt": col > value, "gte": col >= value}
-                    preds.append(op_map[op])
-                elif op == "in":
-                    if not isinstance(value, (list, tuple, set)):
-                        raise TypeError(f"'{key}' expects a list/tuple/set")
-                    preds.append(col.in_(list(value)))
-                elif op == "between":
-                    if not (isinstance(value, (list, tuple)) and len(value) == 2):
-                        raise TypeError(f"'{key}' expects a 2-tuple/list (low, high)")
-                    lo, hi = value
-                    preds.append(col.between(lo, hi))
-                elif op == "like":
-                    preds.append(col.like(value))
-                elif op == "ilike":
-                    preds.append(col.ilike(value))
-                elif op in ("contains", "icontains"):
-                    pattern = f"%{value}%"
-                    preds.append(col.ilike(pattern) if op == "icontains" else col.like(pattern))
-                elif op in ("startswith", "istartswith"):
-                    pattern = f"{value}%"
-                    preds.append(col.ilike(pattern) if op == "istartswith" else col.like(pattern))
-                elif op in ("endswith", "iendswith"):
-                    pattern = f"%{value}"
-                    preds.append(col.ilike(pattern) if op == "iendswith" else col.like(pattern))
-                elif op == "isnull":
-                    preds.append(col.is_(True if value is True else None))
-                elif op == "notnull":
-                    preds.append(col.is_not(None))
-                else:
+                handler = _OPS.get(op)
+                if handler is None:
                     raise ValueError(f"Unsupported operator '__{op}' for field '{field}'")
+                pred = handler(col, value, key)
+                tagged.append((_OP_PRIORITY.get(op, _GROUP_PRIORITY), pred))
+                # Push collection-relationship predicates down into the eager
+                # load as well, so the selectin query fetches only matching
+                # children instead of the full collection per parent.
+                if pushdown_cls is not None:
+                    self._loader_criteria.append((pushdown_cls, pred))
 
         # Handle grouping operators AFTER normal keys so they can wrap sub-dicts
         if group_ors is not None:
             if not isinstance(group_ors, (list, tuple)):
                 raise TypeError("'__or' expects a list")
             branches = [_to_single_pred(obj) for obj in group_ors]
-            preds.append(or_(*branches))
+            tagged.append((_GROUP_PRIORITY, or_(*branches)))
 
         if group_ands is not None:
             if not isinstance(group_ands, (list, tuple)):
                 raise TypeError("'__and' expects a list")
             branches = [_to_single_pred(obj) for obj in group_ands]
-            preds.append(and_(*branches))
+            tagged.append((_GROUP_PRIORITY, and_(*branches)))
+
+        # Stable sort: index-friendly predicates first, original order kept
+        # within each priority band.
+        tagged.sort(key=lambda t: t[0])
+        return [pred for _prio, pred in tagged]
+
+    def _has_collection_filter(self, filters_sig) -> bool:
+        """
+        True if any signature entry filters through a collection relationship.
+        Those predicates get pushed down into the eager load with their
+        literal values, which a bindparam-based cached plan cannot carry into
+        the loader's secondary query, so they must skip the plan cache.
+        """
+        for field, _op, _pname in filters_sig:
+            field = self._normalize_field(field)
+            if "." not in field:
+                continue
+            parts = field.split(".")[:-1]
+            for i in range(1, len(parts) + 1):
+                attr = self._resolve_attr_path(self.model, ".".join(parts[:i]))
+                prop = getattr(attr, "property", None)
+                if prop is not None and getattr(prop, "uselist", False):
+                    return True
+        return False
+
+    def _root_pk_col(self) -> ColumnElement[Any]:
+        pk = _PK_CACHE.get(self.model)
+        if pk is None:
+            pk = _PK_CACHE[self.model] = sqlalchemy.inspect(self.model).primary_key[0]
+        return pk
 
-        return preds
+    def _add_join(self, rel_attr, isouter: bool = False) -> None:
+        self._joins.append((rel_attr, isouter))
+        self._joined_ids.add(id(rel_attr))
 
     def _has_join(self, rel_attr, isouter: bool | None = None) -> bool:
+            if isouter is None:
+                return id(rel_attr) in self._joined_ids
             for a, outer in self._joins:
-                if a is rel_attr and (isouter is None or outer is isouter):
+                if a is rel_attr and outer is isouter:
                     return True
             return False
\ No newline at end of file
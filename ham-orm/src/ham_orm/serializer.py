@@ -2,7 +2,35 @@ import re
 import datetime as dt
 from decimal import Decimal
 from enum import Enum
-from typing import Iterable, Optional, Dict, Any, List
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, Optional, Dict, Any, List, Tuple
+
+try:
+    from sqlalchemy import inspect as _sa_inspect, select as _sa_select
+    from sqlalchemy.orm import selectinload as _selectinload
+    from sqlalchemy.orm.collections import InstrumentedList
+except ImportError:  # pragma: no cover - soft dep; treated as "no such type"
+    InstrumentedList = ()
+    _sa_inspect = None
+
+
+class _FieldPlan:
+    """
+    Compiled form of a fields/includes spec: alias splitting, dotted-path
+    splitting and attrgetter construction done once, then reused for every
+    row of the batch (and, via the lru_cache below, across batches that
+    request the same spec).
+    """
+    __slots__ = ("root_keys", "root_getter", "dotted", "includes", "rel_field_map")
+
+    def __init__(self, root_keys, root_getter, dotted, includes, rel_field_map):
+        self.root_keys = root_keys
+        self.root_getter = root_getter
+        self.dotted = dotted
+        self.includes = includes
+        self.rel_field_map = rel_field_map
+
 
 class Serializer:
     """Serialize ORM rows to JSON-friendly dicts with fields, aliases, and includes."""
@@ -12,7 +40,46 @@ class Serializer:
     @classmethod
     def serialize_many(cls, rows: Iterable[Any], *, fields: Optional[List[str]] = None,
                         includes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        return [cls.serialize_row(r, fields=fields, includes=includes) for r in rows]
+        # Compile the field plan once for the whole batch; identical specs
+        # across batches (paginated endpoints) reuse the cached plan.
+        rows = list(rows)
+        cls._prefetch_unloaded(rows, includes)
+        plan = cls._field_plan(fields, includes)
+        return [cls._apply_plan(r, plan) for r in rows]
+
+    @classmethod
+    def _prefetch_unloaded(cls, rows: List[Any], includes: Optional[List[str]]) -> None:
+        """
+        Batch-load requested relations the query forgot to eager-load.
+
+        Without this, getattr(row, rel) lazy-loads per row — the classic N+1.
+        One selectinload query over the batch's primary keys repopulates the
+        identity-mapped rows, turning N+1 into 1+1. No-op for non-ORM rows or
+        detached instances.
+        """
+        if _sa_inspect is None or not rows or not includes:
+            return
+        try:
+            state = _sa_inspect(rows[0])
+            unloaded = state.unloaded
+            session = state.session
+            mapper = state.mapper
+        except Exception:
+            return
+        if session is None:
+            return
+
+        missing = [rel for rel in includes if rel in unloaded and rel in mapper.relationships]
+        if not missing:
+            return
+
+        model = mapper.class_
+        pk = mapper.primary_key[0]
+        ids = [getattr(r, pk.key, None) for r in rows]
+        stmt = _sa_select(model).where(pk.in_([i for i in ids if i is not None])).options(
+            *(_selectinload(getattr(model, rel)) for rel in missing)
+        )
+        session.execute(stmt).scalars().all()
 
     @classmethod
     def serialize_row(cls, row: Any, *, fields: Optional[List[str]] = None,
@@ -21,25 +88,69 @@ class Serializer:
         fields: e.g. ["study_date as StudyDate", "patient.id as PatientId"]
         includes: e.g. ["patient"] -> nested dict under 'patient'
         """
-        result: Dict[str, Any] = {}
-        rel_field_map: Dict[str, Dict[str, str]] = {}  # {'patient': {'id': 'PatientId', ...}}
+        return cls._apply_plan(row, cls._field_plan(fields, includes))
 
-        # 1) flatten root & dotted fields, respecting aliases
-        for f in (fields or []):
+    @classmethod
+    def _field_plan(cls, fields: Optional[List[str]],
+                    includes: Optional[List[str]]) -> _FieldPlan:
+        # Normalize to hashable tuples so identical specs hit the cache.
+        return cls._compile_plan_cached(
+            tuple(fields) if fields else (),
+            tuple(includes) if includes else (),
+        )
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _compile_plan_cached(cls, fields: Tuple[str, ...],
+                             includes: Tuple[str, ...]) -> _FieldPlan:
+        """
+        Pre-split fields into root fields (fetched in one attrgetter call,
+        which runs in C) and dotted (out_key, segments) pairs walked per row.
+        Also keeps {'patient': {'id': 'PatientId', ...}} for include rendering.
+        """
+        root_keys: List[str] = []
+        root_bases: List[str] = []
+        dotted: List[Tuple[str, Tuple[str, ...]]] = []
+        rel_field_map: Dict[str, Dict[str, str]] = {}
+
+        for f in fields:
             base, alias = cls._split_alias(f)
             if "." in base:
                 rel, leaf = base.split(".", 1)
-                val = cls._get_path(row, base)
                 # remember which related fields were requested (for nested include rendering)
                 rel_field_map.setdefault(rel, {})[leaf] = alias or leaf
-                # also place a flattened key
-                result[alias or base] = cls._to_primitive(val)
+                dotted.append((alias or base, tuple(base.split("."))))
             else:
-                val = getattr(row, base)
-                result[alias or base] = cls._to_primitive(val)
+                root_keys.append(alias or base)
+                root_bases.append(base)
+
+        # attrgetter(*names) returns a bare value for one name, a tuple for
+        # several; normalize so the per-row zip always sees a tuple
+        if len(root_bases) == 1:
+            single = attrgetter(root_bases[0])
+            root_getter = lambda row: (single(row),)
+        elif root_bases:
+            root_getter = attrgetter(*root_bases)
+        else:
+            root_getter = None
+
+        return _FieldPlan(tuple(root_keys), root_getter, tuple(dotted),
+                          includes, rel_field_map)
+
+    @classmethod
+    def _apply_plan(cls, row: Any, plan: _FieldPlan) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+
+        # 1) flatten root & dotted fields, respecting aliases
+        if plan.root_getter is not None:
+            for out_key, val in zip(plan.root_keys, plan.root_getter(row)):
+                result[out_key] = cls._to_primitive(val)
+        for out_key, segments in plan.dotted:
+            result[out_key] = cls._to_primitive(cls._walk(row, segments))
 
         # 2) render requested includes as nested dicts/lists
-        for rel in (includes or []):
+        rel_field_map = plan.rel_field_map
+        for rel in plan.includes:
             rel_obj = getattr(row, rel, None)
             if rel_obj is None:
                 result[rel] = None
@@ -67,37 +178,29 @@ class Serializer:
         Example: Study -> series(list[Series]) -> modality
                  "series.modality" => ["CT", "MR", ...]
         """
-        segments = path.split(".")
-        return cls._walk(obj, segments)
+        return cls._walk(obj, tuple(path.split(".")))
 
     @classmethod
-    def _walk(cls, obj, segments):
-        if not segments:
-            return obj
-
-        # If obj is a collection, map the same remaining segments over each item
-        if isinstance(obj, (list, tuple, set)):
-            return [cls._walk(item, segments) for item in obj]
+    def _walk(cls, obj, segments, start: int = 0):
+        # Iterative hop-by-hop walk; only collection fan-out recurses.
+        i = start
+        n = len(segments)
+        while i < n:
+            # If obj is a collection, map the same remaining segments over each item
+            if isinstance(obj, (list, tuple, set, InstrumentedList)):
+                return [cls._walk(item, segments, i) for item in obj]
 
-        # SQLAlchemy collection relation: InstrumentedList
-        try:
-            from sqlalchemy.orm.collections import InstrumentedList  # local import to avoid hard dep at top
-        except Exception:
-            InstrumentedList = ()  # fallback if not available
-
-        if InstrumentedList and isinstance(obj, InstrumentedList):
-            return [cls._walk(item, segments) for item in obj]
+            # Normal attribute hop
+            seg = segments[i]
+            try:
+                obj = getattr(obj, seg)
+            except AttributeError:
+                raise AttributeError(
+                    f"{type(obj).__name__} has no attribute '{seg}' while resolving '{'.'.join(segments[i:])}'"
+                )
+            i += 1
+        return obj
 
-        # Normal attribute hop
-        seg = segments[0]
-        try:
-            next_obj = getattr(obj, seg)
-        except AttributeError:
-            raise AttributeError(
-                f"{type(obj).__name__} has no attribute '{seg}' while resolving '{'.'.join(segments)}'"
-            )
-        return cls._walk(next_obj, segments[1:])
-    
     @classmethod
     def _serialize_related(cls, obj: Any, requested: Optional[Dict[str, str]]) -> Dict[str, Any]:
         if not requested:
@@ -117,15 +220,17 @@ class Serializer:
 
     @classmethod
     def _to_primitive(cls, v):
-        # Flatten lists/sets/tuples by converting their elements too
+        # Fast path: exact-type dispatch covers the overwhelming majority of
+        # column values in one dict lookup.
+        handler = _PRIMITIVE_HANDLERS.get(type(v))
+        if handler is not None:
+            return handler(v)
+
+        # Slow path: subclasses (and Enum members, whose concrete type is the
+        # enum class itself) fall through to isinstance checks.
         if isinstance(v, (list, tuple, set)):
             return [cls._to_primitive(x) for x in v]
-        # ... keep the rest of your existing _to_primitive logic ...
-        import datetime as dt
-        from decimal import Decimal
-        from enum import Enum
-
-        if v is None or isinstance(v, (str, int, float, bool)):
+        if isinstance(v, (str, int, float, bool)):
             return v
         if isinstance(v, dt.datetime):
             return v.isoformat()
@@ -135,4 +240,25 @@ class Serializer:
             return float(v)
         if isinstance(v, Enum):
             return v.value
-        return str(v)
\ No newline at end of file
+        return str(v)
+
+
+def _serialize_elements(v):
+    # Flatten lists/sets/tuples by converting their elements too
+    return [Serializer._to_primitive(x) for x in v]
+
+
+_PRIMITIVE_HANDLERS = {
+    type(None): lambda v: v,
+    str: lambda v: v,
+    int: lambda v: v,
+    float: lambda v: v,
+    bool: lambda v: v,
+    dt.datetime: dt.datetime.isoformat,
+    dt.date: dt.date.isoformat,
+    dt.time: dt.time.isoformat,
+    Decimal: float,
+    list: _serialize_elements,
+    tuple: _serialize_elements,
+    set: _serialize_elements,
+}
@@ -15,6 +15,10 @@ def tx_wrap(*, refresh_on_commit: bool = True, return_self_on_success: bool = Fa
             autocommit = self.is_autocommit_enabled()
             in_tx = bool(db.in_transaction())
             manage_tx = autocommit and not in_tx
+            # Inner call inside an already-open transaction: guard it with a
+            # SAVEPOINT so a failed child rolls back only its own work, not
+            # the whole chain, and the caller can recover/retry.
+            use_savepoint = autocommit and in_tx
 
             #print(f"tx_wrap: autocommit={autocommit} in_tx={in_tx} manage_tx={manage_tx}")
 
@@ -28,6 +32,19 @@ def tx_wrap(*, refresh_on_commit: bool = True, return_self_on_success: bool = Fa
                     safe_rollback(sess)
                     raise
 
+            sp = db.begin_nested() if use_savepoint else None
+            sp_released = sp is None
+
+            def release_savepoint(ok):
+                # A failed flush deactivates the savepoint but it must still
+                # be rolled back to restore the session, so don't gate on
+                # sp.is_active — only on having released it already.
+                nonlocal sp_released
+                if sp_released:
+                    return
+                sp_released = True
+                sp.commit() if ok else sp.rollback()
+
             try:
                 entity = main_method(self, *args, **kwargs)
                 #print('__entity__=', entity, "manage_tx=", manage_tx)
@@ -37,24 +54,30 @@ def tx_wrap(*, refresh_on_commit: bool = True, return_self_on_success: bool = Fa
                         if refresh_on_commit:
                             try: db.refresh(entity)
                             except SQLAlchemyError: pass
+                    elif sp is not None:
+                        release_savepoint(True)
                     else: db.flush()
                     return self if return_self_on_success else entity
                 if manage_tx:
                     safe_rollback(db)
                     return None
+                release_savepoint(False)
                 raise HookFailed("after_* hook returned False")
             except IntegrityError:
                 if manage_tx:
                     safe_rollback(db)
                     return None
+                release_savepoint(False)
                 raise
             except SQLAlchemyError:
                 if manage_tx:
                     safe_rollback(db)
                     return None
+                release_savepoint(False)
                 raise
             except Exception:
                 if manage_tx: safe_rollback(db)
+                release_savepoint(False)
                 raise
         return wrapper
     return decorator
@@ -0,0 +1,81 @@
+"""
+Shared fixtures for the ham-orm test suite.
+"""
+import copy
+from unittest.mock import Mock
+
+import pytest
+
+# Attribute allow-lists for the spec_set mocks below. Restricting the spec
+# keeps Mock from lazily spawning a full MagicMock (magic methods included)
+# per attribute access, and makes typos in tests fail loudly.
+_SESSION_SPEC = ("add", "commit", "rollback", "refresh", "query")
+_MODEL_SPEC = ("__name__", "id", "name", "email", "age", "relationship", "profile")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--smoke", action="store_true", default=False,
+                     help="run the smoke canaries in test_smoke.py")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the smoke canaries during dev iteration unless --smoke is given."""
+    if config.getoption("--smoke"):
+        return
+    skip_smoke = pytest.mark.skip(reason="smoke canary; opt in with --smoke")
+    for item in items:
+        if "smoke" in item.keywords:
+            item.add_marker(skip_smoke)
+
+
+@pytest.fixture(scope="session")
+def _mock_entity_template():
+    """Build the canonical mock entity once per session; tests get copies."""
+    from test_app_base_model import MockSQLAlchemyModel
+    return MockSQLAlchemyModel()
+
+
+@pytest.fixture
+def mock_entity(_mock_entity_template):
+    """A fresh (shallow-copied) mock entity — avoids re-running Mock() per test."""
+    return copy.copy(_mock_entity_template)
+
+
+@pytest.fixture(scope="session")
+def _mock_db_session_template():
+    """One mock session per session, restricted to the attrs tests touch."""
+    return Mock(spec_set=_SESSION_SPEC)
+
+
+@pytest.fixture(scope="session")
+def _mock_model_template():
+    """Canonical mock SQLAlchemy model, built once per session."""
+    model = Mock(spec_set=_MODEL_SPEC)
+    model.__name__ = "TestModel"
+    model.id = Mock()
+    model.name = Mock()
+    return model
+
+
+@pytest.fixture
+def mock_model(_mock_model_template):
+    """A fresh (shallow-copied) mock model; tests mutate the copy freely."""
+    return copy.copy(_mock_model_template)
+
+
+@pytest.fixture
+def mock_db_session(_mock_db_session_template):
+    """Create a mock database session (module-cached, reset per test)."""
+    _mock_db_session_template.reset_mock(return_value=True, side_effect=True)
+    return _mock_db_session_template
+
+
+@pytest.fixture
+def mock_db_session_minimal(mock_db_session):
+    """Session for tests that only assert commit/rollback.
+
+    Child mocks are created lazily, so this is the same object as
+    mock_db_session — the separate name documents that the test doesn't
+    rely on add/refresh/query ever being touched.
+    """
+    return mock_db_session
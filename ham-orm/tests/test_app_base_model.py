@@ -1,20 +1,47 @@
 """
 Tests for AppBaseModel functionality.
 """
+import copy
+import re
+
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, patch, create_autospec
 from ham_orm import AppBaseModel, dualmethod
 
 
+# Precompiled pytest.raises match patterns (compiled once per module).
+_MODEL_NOT_INIT_RE = re.compile("Model is not initialized")
+_DB_NOT_INIT_RE = re.compile("Database session is not initialized")
+_NOT_FOUND_RE = re.compile("TestModel with id=1 not found")
+_UPDATE_REQUIRES_ID_RE = re.compile("TestModel update requires 'id'")
+
+
+# Tests only ever check that _sa_instance_state gets filtered out, so a
+# shared truthy sentinel is enough — no Mock allocation per entity.
+_SA_STATE_SENTINEL = object()
+
+# Stands in wherever a test only needs "some truthy db/result", no mocking.
+_DB_SENTINEL = object()
+
+
+def _scoped(model_cls):
+    """Throwaway subclass so init_db never mutates shared class state.
+
+    Keeps the parent's __name__ so error-message assertions still match,
+    and leaves the suite safe for parallel (pytest-xdist) runs.
+    """
+    return type(model_cls.__name__, (model_cls,), {})
+
+
 class MockSQLAlchemyModel:
     """Mock SQLAlchemy model for testing."""
     __name__ = "MockModel"
     __tablename__ = "mock_table"
-    
+
     def __init__(self):
         self.id = None
         self.name = None
-        self.__dict__["_sa_instance_state"] = Mock()
+        self.__dict__["_sa_instance_state"] = _SA_STATE_SENTINEL
 
 
 class TestModel(AppBaseModel):
@@ -23,84 +50,100 @@ class TestModel(AppBaseModel):
     _primary_key = "id"
 
 
+class WhitelistModel(AppBaseModel):
+    """Model restricted to whitelisted fields."""
+    _model = MockSQLAlchemyModel
+    _whitelist_fields = ["name"]
+
+
+class InvalidModel(AppBaseModel):
+    """Model with no backing _model; initialization must fail."""
+    _model = None
+
+
+# Module-level so the dualmethod descriptor setup runs once, not per test.
+# Leading underscore keeps pytest from collecting them as test classes.
+class _DualInstance:
+    def __init__(self):
+        self.value = "instance"
+
+    @dualmethod
+    def get_value(self):
+        return self.value
+
+
+class _DualClass:
+    def __init__(self):
+        self.value = "class_instance"
+
+    @dualmethod
+    def get_value(self):
+        return self.value
+
+
 class TestDualMethod:
     """Test dualmethod decorator functionality."""
 
-    def test_dualmethod_on_instance(self):
+    @staticmethod
+    def test_dualmethod_on_instance():
         """Test dualmethod called on instance."""
-        class TestClass:
-            def __init__(self):
-                self.value = "instance"
-                
-            @dualmethod
-            def get_value(self):
-                return self.value
-        
-        instance = TestClass()
-        result = instance.get_value()
+        result = _DualInstance().get_value()
         assert result == "instance"
 
-    def test_dualmethod_on_class(self):
+    @staticmethod
+    def test_dualmethod_on_class():
         """Test dualmethod called on class (creates new instance)."""
-        class TestClass:
-            def __init__(self):
-                self.value = "class_instance"
-                
-            @dualmethod
-            def get_value(self):
-                return self.value
-        
-        result = TestClass.get_value()
+        result = _DualClass.get_value()
         assert result == "class_instance"
 
 
 class TestAppBaseModel:
     """Test AppBaseModel class functionality."""
 
-    @pytest.fixture
-    def mock_db_session(self):
-        """Create a mock database session."""
-        session = Mock()
-        session.add = Mock()
-        session.commit = Mock()
-        session.rollback = Mock()
-        session.refresh = Mock()
-        return session
-
-    @pytest.fixture
-    def test_model_with_db(self, mock_db_session):
-        """Create a test model with initialized database."""
-        TestModel.init_db(mock_db_session)
-        return TestModel
-
-    def test_init_db_class_method(self, mock_db_session):
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def test_model_with_db(_mock_db_session_template):
+        """Initialize a scoped test model's database once per class."""
+        model_cls = _scoped(TestModel)
+        model_cls.init_db(_mock_db_session_template)
+        return model_cls
+
+    @pytest.fixture(scope="module")
+    @staticmethod
+    def _hook_autospec():
+        """Autospec the model once per module; tests copy the hook mocks."""
+        return create_autospec(TestModel, instance=True)
+
+    @staticmethod
+    def test_init_db_class_method(mock_db_session):
         """Test init_db class method."""
-        result = TestModel.init_db(mock_db_session)
-        assert TestModel._db == mock_db_session
-        assert result == TestModel
+        model_cls = _scoped(TestModel)
+        result = model_cls.init_db(mock_db_session)
+        assert model_cls._db == mock_db_session
+        assert result == model_cls
 
-    def test_model_initialization_without_model(self):
+    @staticmethod
+    def test_model_initialization_without_model():
         """Test model initialization without _model set."""
-        class InvalidModel(AppBaseModel):
-            _model = None
-        
-        with pytest.raises(RuntimeError, match="Model is not initialized"):
+        with pytest.raises(RuntimeError, match=_MODEL_NOT_INIT_RE):
             InvalidModel()
 
-    def test_model_initialization_with_entity(self):
+    @staticmethod
+    def test_model_initialization_with_entity(mock_entity):
         """Test model initialization with existing entity."""
-        entity = MockSQLAlchemyModel()
-        model = TestModel(entity=entity)
-        assert model._entity == entity
+        model = TestModel(entity=mock_entity)
+        assert model._entity == mock_entity
 
-    def test_model_initialization_with_attrs(self):
+    @staticmethod
+    def test_model_initialization_with_attrs():
         """Test model initialization with attributes."""
         with patch.object(TestModel, 'populate') as mock_populate:
             attrs = {"name": "test"}
             TestModel(attrs=attrs)
             mock_populate.assert_called_once_with(attrs)
 
-    def test_guard_fields_property(self):
+    @staticmethod
+    def test_guard_fields_property():
         """Test guard_fields property."""
         model = TestModel()
         guard_fields = model.guard_fields
@@ -108,63 +151,71 @@ class TestAppBaseModel:
         for field in expected_fields:
             assert field in guard_fields
 
-    def test_modelname_property(self):
+    @staticmethod
+    def test_modelname_property():
         """Test modelname property."""
         model = TestModel()
         assert model.modelname == "MockModel"
 
-    def test_tablename_property(self):
+    @staticmethod
+    def test_tablename_property():
         """Test tablename property."""
         model = TestModel()
         assert model.tablename == "mock_table"
 
-    def test_ensure_ready_without_db(self):
+    @staticmethod
+    def test_ensure_ready_without_db(monkeypatch):
         """Test _ensure_ready raises error when db not initialized."""
-        TestModel._db = None
-        with pytest.raises(RuntimeError, match="Database session is not initialized"):
+        monkeypatch.setattr(TestModel, "_db", None, raising=False)
+        with pytest.raises(RuntimeError, match=_DB_NOT_INIT_RE):
             TestModel._ensure_ready()
 
-    def test_ensure_ready_without_model(self):
+    @staticmethod
+    def test_ensure_ready_without_model(monkeypatch):
         """Test _ensure_ready raises error when model not set."""
-        TestModel._db = Mock()
-        original_model = TestModel._model
-        TestModel._model = None
-        
-        with pytest.raises(RuntimeError, match="Model is not initialized"):
+        monkeypatch.setattr(TestModel, "_db", _DB_SENTINEL, raising=False)
+        monkeypatch.setattr(TestModel, "_model", None)
+
+        with pytest.raises(RuntimeError, match=_MODEL_NOT_INIT_RE):
             TestModel._ensure_ready()
-        
-        # Restore original model
-        TestModel._model = original_model
 
-    def test_find_with_none_pk(self, test_model_with_db):
+    @staticmethod
+    def test_find_with_none_pk(test_model_with_db):
         """Test find method with None primary key."""
         result = test_model_with_db.find(None)
         assert result is None
 
-    def test_exist_with_none_value(self, test_model_with_db):
+    @staticmethod
+    def test_exist_with_none_value(test_model_with_db):
         """Test exist method with None value."""
         result = test_model_with_db.exist("name", None)
         assert result is False
 
-    def test_exist_with_valid_value(self, test_model_with_db):
+    @staticmethod
+    def test_exist_with_valid_value(test_model_with_db, monkeypatch):
         """Test exist method with valid value."""
-        with patch.object(test_model_with_db, 'first', return_value=Mock()) as mock_first:
-            result = test_model_with_db.exist("name", "test")
-            assert result is True
-            mock_first.assert_called_once()
+        mock_first = Mock(return_value=_DB_SENTINEL)  # any truthy row will do
+        monkeypatch.setattr(test_model_with_db, "first", mock_first)
+
+        result = test_model_with_db.exist("name", "test")
+        assert result is True
+        mock_first.assert_called_once()
 
-    def test_exist_with_exclude_value(self, test_model_with_db):
+    @staticmethod
+    def test_exist_with_exclude_value(test_model_with_db, monkeypatch):
         """Test exist method with exclude_value."""
-        with patch.object(test_model_with_db, 'first', return_value=None) as mock_first:
-            result = test_model_with_db.exist("name", "test", exclude_value=1)
-            assert result is False
-            # Check that the filters include the exclude condition
-            call_args = mock_first.call_args
-            filters = call_args[1]['filters']
-            assert "id__ne" in filters
-            assert filters["id__ne"] == 1
-
-    def test_populate_method(self):
+        mock_first = Mock(return_value=None)
+        monkeypatch.setattr(test_model_with_db, "first", mock_first)
+
+        result = test_model_with_db.exist("name", "test", exclude_value=1)
+        assert result is False
+        # Check that the filters include the exclude condition
+        filters = mock_first.call_args[1]['filters']
+        assert "id__ne" in filters
+        assert filters["id__ne"] == 1
+
+    @staticmethod
+    def test_populate_method():
         """Test populate method."""
         model = TestModel()
         model._entity.name = None
@@ -174,7 +225,8 @@ class TestAppBaseModel:
         
         assert model._entity.name == "test"  # Should be stripped
 
-    def test_populate_with_guard_fields(self):
+    @staticmethod
+    def test_populate_with_guard_fields():
         """Test populate method with guard fields."""
         model = TestModel()
         model._guard_fields = ["protected_field"]
@@ -186,12 +238,9 @@ class TestAppBaseModel:
         # Should not be updated because it's in guard fields
         assert model._entity.protected_field == "original"
 
-    def test_populate_with_whitelist_fields(self):
+    @staticmethod
+    def test_populate_with_whitelist_fields():
         """Test populate method with whitelist fields."""
-        class WhitelistModel(AppBaseModel):
-            _model = MockSQLAlchemyModel
-            _whitelist_fields = ["name"]
-        
         model = WhitelistModel()
         model._entity.name = None
         model._entity.other_field = "original"
@@ -202,156 +251,165 @@ class TestAppBaseModel:
         assert model._entity.name == "allowed"
         assert model._entity.other_field == "original"  # Should not change
 
-    def test_insert_method(self, test_model_with_db):
-        """Test insert method."""
-        with patch.object(test_model_with_db, '_store') as mock_store:
-            data = {"name": "test"}
-            test_model_with_db.insert(data)
-            mock_store.assert_called_once_with(data, is_updating=False, is_saving=False)
-
-    def test_update_method(self, test_model_with_db):
-        """Test update method."""
+    @pytest.mark.parametrize("method,store_kwargs", [
+        ("insert", {"is_updating": False, "is_saving": False}),
+        ("update", {"is_updating": True, "is_saving": False}),
+    ])
+    @staticmethod
+    def test_insert_update_methods(test_model_with_db, method, store_kwargs):
+        """Test insert/update delegate to _store with the right flags."""
         with patch.object(test_model_with_db, '_store') as mock_store:
             data = {"name": "test"}
-            test_model_with_db.update(data)
-            mock_store.assert_called_once_with(data, is_updating=True, is_saving=False)
-
-    def test_save_method_for_new_entity(self, test_model_with_db):
-        """Test save method for new entity (no ID)."""
+            getattr(test_model_with_db, method)(data)
+            mock_store.assert_called_once_with(data, **store_kwargs)
+
+    @pytest.mark.parametrize("entity_id,store_kwargs", [
+        (None, {"is_updating": False, "is_saving": True}),  # new entity
+        (1, {"is_updating": True, "is_saving": True}),      # existing entity
+    ])
+    @staticmethod
+    def test_save_method(test_model_with_db, entity_id, store_kwargs):
+        """Test save picks insert vs update based on the entity's ID."""
         model = test_model_with_db()
-        model._entity.id = None
-        
-        with patch.object(model, '_store') as mock_store:
-            data = {"name": "test"}
-            model.save(data)
-            mock_store.assert_called_once_with(data, is_updating=False, is_saving=True)
+        model._entity.id = entity_id
 
-    def test_save_method_for_existing_entity(self, test_model_with_db):
-        """Test save method for existing entity (has ID)."""
-        model = test_model_with_db()
-        model._entity.id = 1
-        
         with patch.object(model, '_store') as mock_store:
             data = {"name": "test"}
             model.save(data)
-            mock_store.assert_called_once_with(data, is_updating=True, is_saving=True)
+            mock_store.assert_called_once_with(data, **store_kwargs)
 
-    def test_store_insert_success(self, test_model_with_db, mock_db_session):
+    @staticmethod
+    def test_store_insert_success(test_model_with_db, mock_db_session, _hook_autospec):
         """Test _store method for successful insert."""
         model = test_model_with_db()
-        
-        with patch.object(model, 'before_insert', return_value={"name": "test"}) as mock_before, \
-             patch.object(model, 'after_insert', return_value=True) as mock_after, \
-             patch.object(model, 'populate') as mock_populate:
-            
-            result = model._store({"name": "test"}, is_updating=False, is_saving=False)
-            
-            assert result == model
-            mock_before.assert_called_once_with({"name": "test"})
-            mock_after.assert_called_once()
-            mock_populate.assert_called_once_with({"name": "test"})
-            mock_db_session.add.assert_called_once_with(model._entity)
-            mock_db_session.commit.assert_called_once()
-            mock_db_session.refresh.assert_called_once_with(model._entity)
-
-    def test_store_insert_after_hook_fails(self, test_model_with_db, mock_db_session):
+        model.before_insert = copy.copy(_hook_autospec.before_insert)
+        model.before_insert.return_value = {"name": "test"}
+        model.after_insert = copy.copy(_hook_autospec.after_insert)
+        model.after_insert.return_value = True
+        model.populate = copy.copy(_hook_autospec.populate)
+
+        result = model._store({"name": "test"}, is_updating=False, is_saving=False)
+
+        assert result == model
+        model.before_insert.assert_called_once_with({"name": "test"})
+        model.after_insert.assert_called_once()
+        model.populate.assert_called_once_with({"name": "test"})
+        mock_db_session.add.assert_called_once_with(model._entity)
+        mock_db_session.commit.assert_called_once()
+        mock_db_session.refresh.assert_called_once_with(model._entity)
+
+    @staticmethod
+    def test_store_insert_after_hook_fails(test_model_with_db, mock_db_session_minimal, _hook_autospec):
         """Test _store method when after_insert returns False."""
         model = test_model_with_db()
-        
-        with patch.object(model, 'before_insert', return_value={"name": "test"}), \
-             patch.object(model, 'after_insert', return_value=False), \
-             patch.object(model, 'populate'):
-            
-            result = model._store({"name": "test"}, is_updating=False, is_saving=False)
-            
-            assert result is None
-            mock_db_session.rollback.assert_called_once()
-
-    def test_store_update_success(self, test_model_with_db, mock_db_session):
+        model.before_insert = copy.copy(_hook_autospec.before_insert)
+        model.before_insert.return_value = {"name": "test"}
+        model.after_insert = copy.copy(_hook_autospec.after_insert)
+        model.after_insert.return_value = False
+        model.populate = copy.copy(_hook_autospec.populate)
+
+        result = model._store({"name": "test"}, is_updating=False, is_saving=False)
+
+        assert result is None
+        mock_db_session_minimal.rollback.assert_called_once()
+
+    @staticmethod
+    def test_store_update_success(test_model_with_db, mock_db_session, _hook_autospec):
         """Test _store method for successful update."""
         model = test_model_with_db()
         model._entity.id = 1
-        
-        with patch.object(test_model_with_db, 'find', return_value=model), \
-             patch.object(model, 'before_update', return_value={"name": "updated"}) as mock_before, \
-             patch.object(model, 'after_update', return_value=True) as mock_after, \
-             patch.object(model, 'populate') as mock_populate:
-            
+        model.before_update = copy.copy(_hook_autospec.before_update)
+        model.before_update.return_value = {"name": "updated"}
+        model.after_update = copy.copy(_hook_autospec.after_update)
+        model.after_update.return_value = True
+        model.populate = copy.copy(_hook_autospec.populate)
+
+        with patch.object(test_model_with_db, 'find', return_value=model):
             result = model._store({"name": "updated"}, is_updating=True, is_saving=False)
-            
-            assert result == model
-            mock_before.assert_called_once_with({"name": "updated"})
-            mock_after.assert_called_once()
-            mock_populate.assert_called_once_with({"name": "updated"})
-            mock_db_session.commit.assert_called_once()
-
-    def test_store_update_not_found(self, test_model_with_db):
+
+        assert result == model
+        model.before_update.assert_called_once_with({"name": "updated"})
+        model.after_update.assert_called_once()
+        model.populate.assert_called_once_with({"name": "updated"})
+        mock_db_session.commit.assert_called_once()
+
+    @staticmethod
+    def test_store_update_not_found(test_model_with_db):
         """Test _store method when entity not found for update."""
         model = test_model_with_db()
         
         with patch.object(test_model_with_db, 'find', return_value=None):
-            with pytest.raises(LookupError, match="TestModel with id=1 not found"):
+            with pytest.raises(LookupError, match=_NOT_FOUND_RE):
                 model._store({"id": 1, "name": "updated"}, is_updating=True)
 
-    def test_store_update_no_pk(self, test_model_with_db):
+    @staticmethod
+    def test_store_update_no_pk(test_model_with_db):
         """Test _store method for update without primary key."""
         model = test_model_with_db()
         model._entity.id = None
         
-        with pytest.raises(ValueError, match="TestModel update requires 'id'"):
+        with pytest.raises(ValueError, match=_UPDATE_REQUIRES_ID_RE):
             model._store({"name": "updated"}, is_updating=True)
 
-    def test_attribute_proxying_getattr(self):
+    @staticmethod
+    def test_attribute_proxying_getattr():
         """Test __getattr__ proxying to entity."""
         model = TestModel()
         model._entity.custom_attr = "test_value"
         
         assert model.custom_attr == "test_value"
 
-    def test_attribute_proxying_getattr_nonexistent(self):
+    @staticmethod
+    def test_attribute_proxying_getattr_nonexistent():
         """Test __getattr__ with nonexistent attribute."""
         model = TestModel()
         
         with pytest.raises(AttributeError):
             _ = model.nonexistent_attr
 
-    def test_attribute_proxying_getattr_private(self):
+    @staticmethod
+    def test_attribute_proxying_getattr_private():
         """Test __getattr__ with private attribute."""
         model = TestModel()
         
         with pytest.raises(AttributeError):
             _ = model._private_attr
 
-    def test_attribute_proxying_setattr(self):
+    @staticmethod
+    def test_attribute_proxying_setattr():
         """Test __setattr__ proxying to entity."""
         model = TestModel()
         model.custom_attr = "test_value"
         
         assert model._entity.custom_attr == "test_value"
 
-    def test_attribute_proxying_delattr(self):
+    @staticmethod
+    def test_attribute_proxying_delattr():
         """Test __delattr__ proxying to entity."""
         model = TestModel()
         model._entity.custom_attr = "test_value"
         
         del model.custom_attr
-        assert not hasattr(model._entity, "custom_attr")
+        # Direct __dict__ check skips the __getattr__ proxy walk hasattr triggers
+        assert "custom_attr" not in model._entity.__dict__
 
-    def test_iteration(self):
+    @staticmethod
+    def test_iteration():
         """Test __iter__ method."""
         model = TestModel()
         model._entity.id = 1
         model._entity.name = "test"
-        
-        items = list(model)
-        # Filter out _sa_instance_state
-        items = [(k, v) for k, v in items if k != "_sa_instance_state"]
-        
+
+        # One pass over the model; drop the SQLAlchemy bookkeeping key
+        items = dict(model)
+        items.pop("_sa_instance_state", None)
+
         assert len(items) >= 2
-        assert ("id", 1) in items
-        assert ("name", "test") in items
+        assert items.get("id") == 1
+        assert items.get("name") == "test"
 
-    def test_string_representation(self):
+    @staticmethod
+    def test_string_representation():
         """Test __str__ method."""
         model = TestModel()
         model._entity.id = 1
@@ -362,19 +420,18 @@ class TestAppBaseModel:
         assert "name" in str_repr
         assert "_sa_instance_state" not in str_repr
 
-    def test_before_hooks_default_behavior(self):
-        """Test that before_* hooks return data unchanged by default."""
+    @pytest.mark.parametrize("hook,args,expected", [
+        # before_* hooks return the data unchanged by default
+        ("before_save", ({"name": "test"},), {"name": "test"}),
+        ("before_insert", ({"name": "test"},), {"name": "test"}),
+        ("before_update", ({"name": "test"},), {"name": "test"}),
+        # after_* hooks return True by default
+        ("after_save", (None,), True),
+        ("after_insert", (), True),
+        ("after_update", (None,), True),
+    ])
+    @staticmethod
+    def test_hook_default(hook, args, expected):
+        """Test default hook behavior (before_* pass data through, after_* True)."""
         model = TestModel()
-        
-        data = {"name": "test"}
-        assert model.before_save(data) == data
-        assert model.before_insert(data) == data
-        assert model.before_update(data) == data
-
-    def test_after_hooks_default_behavior(self):
-        """Test that after_* hooks return True by default."""
-        model = TestModel()
-        
-        assert model.after_save(None) is True
-        assert model.after_insert() is True
-        assert model.after_update(None) is True
+        assert getattr(model, hook)(*args) == expected
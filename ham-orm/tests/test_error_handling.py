@@ -1,21 +1,47 @@
 """
 Error handling and edge case tests for ham-orm.
 """
+import copy
+import re
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, create_autospec
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from ham_orm import AppBaseModel, QueryBuilder
 
 
+# Precompiled pytest.raises match patterns (compiled once per module).
+_VALIDATION_ERROR_RE = re.compile("validation error")
+_NO_ATTR_RE = re.compile("MockModel has no attribute 'nonexistent'")
+_UNSUPPORTED_OP_RE = re.compile("Unsupported operator '__invalid'")
+_IN_TYPE_RE = re.compile("'name__in' expects a list/tuple/set")
+_BETWEEN_TYPE_RE = re.compile("'age__between' expects a 2-tuple/list")
+_PRIVATE_ATTR_RE = re.compile("ErrorTestModel has no attribute '_private'")
+_HOOK_FAILED_RE = re.compile("Hook failed")
+_NOT_FOUND_RE = re.compile("ErrorTestModel with id=999 not found")
+
+
+# Shared truthy sentinel; see test_app_base_model for rationale.
+_SA_STATE_SENTINEL = object()
+
+# Fields expected in the complex-data string representation.
+_EXPECTED_STR_FIELDS = ("id", "name", "data", "numbers")
+
+
 class MockModel:
     """Mock SQLAlchemy model for error testing."""
     __name__ = "MockModel"
     __tablename__ = "mock_table"
-    
+
+    # Column-like mocks built once; per-test MockModel.name = Mock()
+    # assignments leaked state across tests.
+    name = Mock()
+    age = Mock()
+
     def __init__(self):
         self.id = None
         self.name = None
-        self.__dict__["_sa_instance_state"] = Mock()
+        self.__dict__["_sa_instance_state"] = _SA_STATE_SENTINEL
 
 
 class ErrorTestModel(AppBaseModel):
@@ -23,103 +49,92 @@ class ErrorTestModel(AppBaseModel):
     _model = MockModel
 
 
+def _scoped(model_cls):
+    """Throwaway subclass so init_db never mutates shared class state."""
+    return type(model_cls.__name__, (model_cls,), {})
+
+
 class TestErrorHandling:
     """Test error handling and edge cases."""
 
-    @pytest.fixture
-    def mock_db_session(self):
-        """Create mock database session."""
-        session = Mock()
-        session.add = Mock()
-        session.commit = Mock()
-        session.rollback = Mock()
-        session.refresh = Mock()
-        session.query = Mock()
-        return session
-
-    def test_store_integrity_error(self, mock_db_session):
+    @pytest.fixture(scope="module")
+    @staticmethod
+    def _hook_autospec():
+        """Autospec the model once per module; tests copy the hook mocks."""
+        return create_autospec(ErrorTestModel, instance=True)
+
+    def test_store_integrity_error(self, mock_db_session, _hook_autospec):
         """Test _store method handles IntegrityError correctly."""
-        ErrorTestModel.init_db(mock_db_session)
-        model = ErrorTestModel()
-        
+        model_cls = _scoped(ErrorTestModel)
+        model_cls.init_db(mock_db_session)
+        model = model_cls()
+
         # Mock commit to raise IntegrityError
         mock_db_session.commit.side_effect = IntegrityError("statement", "params", "orig")
-        
-        with patch.object(model, 'before_insert', return_value={"name": "test"}), \
-             patch.object(model, 'after_insert', return_value=True), \
-             patch.object(model, 'populate'):
-            
-            result = model._store({"name": "test"}, is_updating=False, is_saving=False)
-            
-            assert result is None  # Should return None on IntegrityError
-            mock_db_session.rollback.assert_called_once()
+        model.before_insert = copy.copy(_hook_autospec.before_insert)
+        model.before_insert.return_value = {"name": "test"}
+        model.after_insert = copy.copy(_hook_autospec.after_insert)
+        model.after_insert.return_value = True
+        model.populate = copy.copy(_hook_autospec.populate)
 
-    def test_store_sqlalchemy_error(self, mock_db_session):
+        result = model._store({"name": "test"}, is_updating=False, is_saving=False)
+
+        assert result is None  # Should return None on IntegrityError
+        mock_db_session.rollback.assert_called_once()
+
+    def test_store_sqlalchemy_error(self, mock_db_session, _hook_autospec):
         """Test _store method handles SQLAlchemyError correctly."""
-        ErrorTestModel.init_db(mock_db_session)
-        model = ErrorTestModel()
-        
+        model_cls = _scoped(ErrorTestModel)
+        model_cls.init_db(mock_db_session)
+        model = model_cls()
+
         # Mock commit to raise SQLAlchemyError
         mock_db_session.commit.side_effect = SQLAlchemyError("database error")
-        
-        with patch.object(model, 'before_insert', return_value={"name": "test"}), \
-             patch.object(model, 'after_insert', return_value=True), \
-             patch.object(model, 'populate'):
-            
-            result = model._store({"name": "test"}, is_updating=False, is_saving=False)
-            
-            assert result is None  # Should return None on SQLAlchemyError
-            mock_db_session.rollback.assert_called_once()
+        model.before_insert = copy.copy(_hook_autospec.before_insert)
+        model.before_insert.return_value = {"name": "test"}
+        model.after_insert = copy.copy(_hook_autospec.after_insert)
+        model.after_insert.return_value = True
+        model.populate = copy.copy(_hook_autospec.populate)
+
+        result = model._store({"name": "test"}, is_updating=False, is_saving=False)
+
+        assert result is None  # Should return None on SQLAlchemyError
+        mock_db_session.rollback.assert_called_once()
 
-    def test_store_general_exception(self, mock_db_session):
+    def test_store_general_exception(self, mock_db_session, _hook_autospec):
         """Test _store method re-raises general exceptions."""
-        ErrorTestModel.init_db(mock_db_session)
-        model = ErrorTestModel()
-        
+        model_cls = _scoped(ErrorTestModel)
+        model_cls.init_db(mock_db_session)
+        model = model_cls()
+
         # Mock populate to raise a general exception
-        with patch.object(model, 'before_insert', return_value={"name": "test"}), \
-             patch.object(model, 'populate', side_effect=ValueError("validation error")):
-            
-            with pytest.raises(ValueError, match="validation error"):
-                model._store({"name": "test"}, is_updating=False, is_saving=False)
-            
-            mock_db_session.rollback.assert_called_once()
+        model.before_insert = copy.copy(_hook_autospec.before_insert)
+        model.before_insert.return_value = {"name": "test"}
+        model.populate = copy.copy(_hook_autospec.populate)
+        model.populate.side_effect = ValueError("validation error")
 
-    def test_query_builder_attr_resolution_error(self, mock_db_session):
-        """Test QueryBuilder handles attribute resolution errors."""
-        qb = QueryBuilder(mock_db_session, MockModel)
-        
-        with pytest.raises(ValueError, match="MockModel has no attribute 'nonexistent'"):
-            qb._resolve_attr(MockModel, "nonexistent")
+        with pytest.raises(ValueError, match=_VALIDATION_ERROR_RE):
+            model._store({"name": "test"}, is_updating=False, is_saving=False)
 
-    def test_query_builder_invalid_filter_operator(self, mock_db_session):
-        """Test QueryBuilder handles invalid filter operators."""
-        MockModel.name = Mock()
-        qb = QueryBuilder(mock_db_session, MockModel)
-        
-        with pytest.raises(ValueError, match="Unsupported operator '__invalid'"):
-            qb._build_predicates({"name__invalid": "test"})
+        mock_db_session.rollback.assert_called_once()
 
-    def test_query_builder_invalid_in_operator_type(self, mock_db_session):
-        """Test QueryBuilder validates 'in' operator argument types."""
-        MockModel.name = Mock()
+    @pytest.mark.parametrize("call,exc,match_re", [
+        # attribute resolution
+        (lambda qb: qb._resolve_attr(MockModel, "nonexistent"), ValueError, _NO_ATTR_RE),
+        # unknown filter operator
+        (lambda qb: qb._build_predicates({"name__invalid": "test"}), ValueError, _UNSUPPORTED_OP_RE),
+        # 'in' wants a collection
+        (lambda qb: qb._build_predicates({"name__in": "not_a_list"}), TypeError, _IN_TYPE_RE),
+        # 'between' wants exactly two values
+        (lambda qb: qb._build_predicates({"age__between": [1, 2, 3]}), TypeError, _BETWEEN_TYPE_RE),
+        (lambda qb: qb._build_predicates({"age__between": "not_a_list"}), TypeError, _BETWEEN_TYPE_RE),
+    ])
+    def test_query_builder_validation_errors(self, mock_db_session, call, exc, match_re):
+        """Test QueryBuilder input validation raises the documented errors."""
         qb = QueryBuilder(mock_db_session, MockModel)
-        
-        with pytest.raises(TypeError, match="'name__in' expects a list/tuple/set"):
-            qb._build_predicates({"name__in": "not_a_list"})
 
-    def test_query_builder_invalid_between_operator_type(self, mock_db_session):
-        """Test QueryBuilder validates 'between' operator argument types."""
-        MockModel.age = Mock()
-        qb = QueryBuilder(mock_db_session, MockModel)
-        
-        # Test with wrong number of elements
-        with pytest.raises(TypeError, match="'age__between' expects a 2-tuple/list"):
-            qb._build_predicates({"age__between": [1, 2, 3]})
-        
-        # Test with non-list/tuple
-        with pytest.raises(TypeError, match="'age__between' expects a 2-tuple/list"):
-            qb._build_predicates({"age__between": "not_a_list"})
+        with pytest.raises(exc, match=match_re):
+            call(qb)
 
     def test_app_base_model_no_entity_attribute_error(self):
         """Test AppBaseModel handles missing entity attributes properly."""
@@ -132,7 +147,7 @@ class TestErrorHandling:
         """Test AppBaseModel handles private attribute access."""
         model = ErrorTestModel()
         
-        with pytest.raises(AttributeError, match="ErrorTestModel has no attribute '_private'"):
+        with pytest.raises(AttributeError, match=_PRIVATE_ATTR_RE):
             _ = model._private
 
     def test_populate_with_none_entity(self):
@@ -160,7 +175,7 @@ class TestErrorHandling:
         FailingHooksModel.init_db(mock_db_session)
         model = FailingHooksModel()
         
-        with pytest.raises(ValueError, match="Hook failed"):
+        with pytest.raises(ValueError, match=_HOOK_FAILED_RE):
             model._store({"name": "test"}, is_updating=False, is_saving=False)
         
         # Should still rollback on exception
@@ -168,19 +183,21 @@ class TestErrorHandling:
 
     def test_update_without_existing_record(self, mock_db_session):
         """Test update operation when record doesn't exist."""
-        ErrorTestModel.init_db(mock_db_session)
-        model = ErrorTestModel()
+        model_cls = _scoped(ErrorTestModel)
+        model_cls.init_db(mock_db_session)
+        model = model_cls()
         
         with patch.object(ErrorTestModel, 'find', return_value=None):
-            with pytest.raises(LookupError, match="ErrorTestModel with id=999 not found"):
+            with pytest.raises(LookupError, match=_NOT_FOUND_RE):
                 model._store({"id": 999, "name": "test"}, is_updating=True)
 
     def test_save_method_pk_determination(self, mock_db_session):
         """Test save method correctly determines if it's updating or inserting."""
-        ErrorTestModel.init_db(mock_db_session)
-        
+        model_cls = _scoped(ErrorTestModel)
+        model_cls.init_db(mock_db_session)
+
         # Test with entity that has ID (should update)
-        model = ErrorTestModel()
+        model = model_cls()
         model._entity.id = 1
         
         with patch.object(model, '_store') as mock_store:
@@ -188,7 +205,7 @@ class TestErrorHandling:
             mock_store.assert_called_once_with({"name": "test"}, is_updating=True, is_saving=True)
         
         # Test with entity that has no ID but data contains ID (should update)
-        model = ErrorTestModel()
+        model = model_cls()
         model._entity.id = None
         
         with patch.object(model, '_store') as mock_store:
@@ -196,7 +213,7 @@ class TestErrorHandling:
             mock_store.assert_called_once_with({"id": 1, "name": "test"}, is_updating=True, is_saving=True)
         
         # Test with no ID anywhere (should insert)
-        model = ErrorTestModel()
+        model = model_cls()
         model._entity.id = None
         
         with patch.object(model, '_store') as mock_store:
@@ -214,7 +231,8 @@ class TestErrorHandling:
         # Test deleting private attribute (should use object.__delattr__)
         model._private_attr = "test"
         del model._private_attr
-        assert not hasattr(model, "_private_attr")
+        # Direct __dict__ check skips the __getattr__ proxy walk hasattr triggers
+        assert "_private_attr" not in model.__dict__
 
     def test_string_representation_with_complex_data(self):
         """Test string representation with various data types."""
@@ -227,24 +245,22 @@ class TestErrorHandling:
         model._entity.numbers = [1, 2, 3]
         
         str_repr = str(model)
-        
+
         # Should contain all fields except _sa_instance_state
-        assert "id" in str_repr
-        assert "name" in str_repr
-        assert "data" in str_repr
-        assert "numbers" in str_repr
+        assert all(f in str_repr for f in _EXPECTED_STR_FIELDS)
         assert "_sa_instance_state" not in str_repr
 
     def test_iteration_with_edge_cases(self):
         """Test iteration behavior with edge cases."""
         model = ErrorTestModel()
-        
+
         # Test with minimal entity
         model._entity.id = None
         model._entity.name = None
-        
-        items = list(model)
-        filtered_items = [(k, v) for k, v in items if k != "_sa_instance_state"]
-        
-        assert ("id", None) in filtered_items
-        assert ("name", None) in filtered_items
+
+        # One pass over the model; drop the SQLAlchemy bookkeeping key
+        items = dict(model)
+        items.pop("_sa_instance_state", None)
+
+        assert "id" in items and items["id"] is None
+        assert "name" in items and items["name"] is None
@@ -2,23 +2,86 @@
 Integration tests for ham-orm package.
 These tests demonstrate real usage patterns.
 """
+import copy
+from contextlib import contextmanager
+
 import pytest
 from unittest.mock import Mock, MagicMock
 from ham_orm import AppBaseModel, QueryBuilder, dualmethod
 
 
+@contextmanager
+def swap(obj, name, value):
+    """Swap obj.<name> for value, restoring the original on exit."""
+    missing = object()
+    original = getattr(obj, name, missing)
+    setattr(obj, name, value)
+    try:
+        yield value
+    finally:
+        if original is missing:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, original)
+
+
+# Shared truthy sentinel; see test_app_base_model for rationale.
+_SA_STATE_SENTINEL = object()
+
+
 # Mock SQLAlchemy classes for integration testing
 class MockUser:
     """Mock SQLAlchemy User model."""
     __name__ = "User"
     __tablename__ = "users"
-    
+
     def __init__(self):
         self.id = None
         self.name = None
         self.email = None
         self.age = None
-        self.__dict__["_sa_instance_state"] = Mock()
+        # Tests only check presence/filtering of this key, so a shared
+        # sentinel beats constructing a Mock per instance.
+        self.__dict__["_sa_instance_state"] = _SA_STATE_SENTINEL
+
+
+@pytest.fixture(scope="session")
+def _user_model_template():
+    """Default-constructed UserModel, shared by read-only assertions."""
+    return UserModel()
+
+
+@pytest.fixture
+def user_model(_user_model_template):
+    """Fresh shallow copy for tests that mutate model state."""
+    return copy.copy(_user_model_template)
+
+
+@pytest.fixture(scope="session")
+def built_qb(_mock_db_session_template, _mock_model_template):
+    """A fully built query chain, shared by the read-only chain assertions."""
+    qb = QueryBuilder(_mock_db_session_template, _mock_model_template)
+    return (qb.where({"name": "John", "age__gte": 18})
+              .order_by("-id", "name").limit(10).offset(5)
+              .include("profile").only("id", "name", "email"))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _prepare_mockuser_columns():
+    """Install column mocks on MockUser once per module.
+
+    Instance attributes set in MockUser.__init__ shadow these, so only
+    class-level attribute resolution (the query-builder paths) sees them.
+    """
+    MockUser.id = Mock()
+    MockUser.name = Mock()
+    MockUser.email = Mock()
+    MockUser.age = Mock()
+    MockUser.name.__eq__ = Mock(return_value="name_eq")
+    MockUser.name.ilike = Mock(return_value="name_ilike")
+    MockUser.age.__gte__ = Mock(return_value="age_gte")
+    MockUser.age.between = Mock(return_value="age_between")
+    MockUser.email.in_ = Mock(return_value="email_in")
 
 
 class UserModel(AppBaseModel):
@@ -30,75 +93,52 @@ class UserModel(AppBaseModel):
 
 class TestIntegration:
     """Integration tests for the ham-orm package."""
-    
-    @pytest.fixture
-    def mock_db_session(self):
-        """Create a comprehensive mock database session."""
-        session = Mock()
-        session.add = Mock()
-        session.commit = Mock()
-        session.rollback = Mock()
-        session.refresh = Mock()
-        session.query = Mock()  # For legacy support
-        return session
-
-    def test_model_crud_workflow(self, mock_db_session):
+
+    @pytest.fixture(scope="class", autouse=True)
+    @staticmethod
+    def _init_usermodel(request, _mock_db_session_template):
+        """Bind UserModel to the shared mock session once for the class."""
+        UserModel.init_db(_mock_db_session_template)
+        request.cls._shared_session = _mock_db_session_template
+        yield
+        UserModel._db = None
+
+    def test_model_crud_workflow(self, _user_model_template):
         """Test complete CRUD workflow with the model."""
-        # Initialize the model with database
-        UserModel.init_db(mock_db_session)
-        
         # Test 1: Create new user (insert)
         user_data = {"name": "John Doe", "age": 30}
-        
-        # Mock the behavior for successful insert
-        with pytest.patch.object(UserModel, '_store') as mock_store:
-            mock_store.return_value = UserModel()
+
+        # Mock the behavior for successful insert; the stored result is only
+        # checked for truthiness, so the shared template serves as-is
+        with swap(UserModel, '_store', Mock(return_value=_user_model_template)) as mock_store:
             new_user = UserModel.insert(user_data)
             assert new_user is not None
             mock_store.assert_called_once_with(user_data, is_updating=False, is_saving=False)
-        
+
         # Test 2: Find user by ID
-        with pytest.patch.object(UserModel, 'first') as mock_first:
-            mock_user_entity = MockUser()
-            mock_user_entity.id = 1
-            mock_user_entity.name = "John Doe"
-            mock_first.return_value = UserModel(entity=mock_user_entity)
-            
+        mock_user_entity = MockUser()
+        mock_user_entity.id = 1
+        mock_user_entity.name = "John Doe"
+        with swap(UserModel, 'first', Mock(return_value=UserModel(entity=mock_user_entity))):
             found_user = UserModel.find(1)
             assert found_user is not None
             assert found_user.name == "John Doe"
-        
+
         # Test 3: Update user
         update_data = {"name": "John Smith"}
-        with pytest.patch.object(UserModel, '_store') as mock_store:
-            mock_store.return_value = UserModel()
+        with swap(UserModel, '_store', Mock(return_value=_user_model_template)) as mock_store:
             updated_user = UserModel.update(update_data)
             assert updated_user is not None
             mock_store.assert_called_once_with(update_data, is_updating=True, is_saving=False)
 
-    def test_query_builder_integration(self, mock_db_session):
+    def test_query_builder_integration(self, built_qb):
         """Test QueryBuilder integration with various query patterns."""
-        # Create QueryBuilder instance
-        qb = QueryBuilder(mock_db_session, MockUser)
-        
-        # Test chaining methods
-        query_builder = (qb
-                        .where({"name": "John", "age__gte": 18})
-                        .order_by("-id", "name")
-                        .limit(10)
-                        .offset(5)
-                        .include("profile")
-                        .only("id", "name", "email"))
-        
-        # Verify it's still the same instance (for chaining)
-        assert query_builder is qb
-        
-        # Check internal state
-        assert qb._limit == 10
-        assert qb._offset == 5
-        assert len(qb._order_by) == 2  # -id and name
-        assert len(qb._includes) == 1  # profile
-        assert len(qb._only_cols) == 3  # id, name, email
+        # The shared chain is built once; these assertions are read-only.
+        assert built_qb._limit == 10
+        assert built_qb._offset == 5
+        assert len(built_qb._order_by) == 2  # -id and name
+        assert len(built_qb._includes) == 1  # profile
+        assert len(built_qb._only_cols) == 3  # id, name, email
 
     def test_dualmethod_integration(self):
         """Test dualmethod decorator in real usage scenarios."""
@@ -119,24 +159,25 @@ class TestIntegration:
         result_class = TestModel.custom_operation()
         assert result_class == "Operation on User"
 
-    def test_model_validation_and_error_handling(self, mock_db_session):
+    @pytest.fixture(autouse=True)
+    @staticmethod
+    def _restore_user_model_db(_mock_db_session_template):
+        """Re-bind UserModel after tests that wipe its session."""
+        yield
+        UserModel._db = _mock_db_session_template
+
+    @pytest.mark.parametrize("setup,call,msg", [
+        # model class missing its _model
+        (lambda: type("Bad", (AppBaseModel,), {"_model": None}),
+         lambda cls: cls(), "Model is not initialized"),
+        # operations without an initialized session
+        (lambda: (setattr(UserModel, "_db", None) or UserModel),
+         lambda cls: cls.first(), "Database session is not initialized"),
+    ])
+    def test_model_validation_and_error_handling(self, setup, call, msg):
         """Test validation and error handling scenarios."""
-        UserModel.init_db(mock_db_session)
-        
-        # Test 1: Model without _model should raise error
-        class InvalidModel(AppBaseModel):
-            _model = None
-        
-        with pytest.raises(RuntimeError, match="Model is not initialized"):
-            InvalidModel()
-        
-        # Test 2: Database operations without initialized session
-        UserModel._db = None
-        with pytest.raises(RuntimeError, match="Database session is not initialized"):
-            UserModel.first()
-        
-        # Restore session for other tests
-        UserModel._db = mock_db_session
+        with pytest.raises(RuntimeError, match=msg):
+            call(setup())
 
     def test_field_protection_and_whitelisting(self):
         """Test field protection (guard fields) and whitelisting."""
@@ -189,30 +230,22 @@ class TestIntegration:
         model = CustomUserModel()
         
         # Test hooks are called during store operations
-        with pytest.patch.object(model, 'before_insert', return_value={"name": "test"}) as mock_before, \
-             pytest.patch.object(model, 'after_insert', return_value=True) as mock_after, \
-             pytest.patch.object(model, 'populate'):
-            
+        # Direct assignment beats stacking three context managers here
+        old = (model.before_insert, model.after_insert, model.populate)
+        model.before_insert = Mock(return_value={"name": "test"})
+        model.after_insert = Mock(return_value=True)
+        model.populate = Mock()
+        try:
             model._store({"name": "test"}, is_updating=False, is_saving=False)
-            
-            mock_before.assert_called_once()
-            mock_after.assert_called_once()
+
+            model.before_insert.assert_called_once()
+            model.after_insert.assert_called_once()
+        finally:
+            model.before_insert, model.after_insert, model.populate = old
 
     def test_complex_query_scenarios(self, mock_db_session):
         """Test complex query building scenarios."""
-        # Setup mock attributes on MockUser
-        MockUser.id = Mock()
-        MockUser.name = Mock()
-        MockUser.email = Mock()
-        MockUser.age = Mock()
-        
-        # Mock the attribute resolution for various operators
-        MockUser.name.__eq__ = Mock(return_value="name_eq")
-        MockUser.name.ilike = Mock(return_value="name_ilike")
-        MockUser.age.__gte__ = Mock(return_value="age_gte")
-        MockUser.age.between = Mock(return_value="age_between")
-        MockUser.email.in_ = Mock(return_value="email_in")
-        
+        # Column mocks come from the module-level _prepare_mockuser_columns fixture
         qb = QueryBuilder(mock_db_session, MockUser)
         
         # Test complex filter combinations
@@ -250,9 +283,7 @@ class TestIntegration:
         user_entity.id = 1
         user_entity.name = "John"
         
-        items = dict(model)
-        # Should contain entity attributes except _sa_instance_state
-        assert "id" in items
-        assert "name" in items
-        assert "custom_field" in items
-        assert "_sa_instance_state" not in items
+        # Only membership matters here; skip materializing the values dict
+        keys = {k for k, _ in model}
+        assert {"id", "name", "custom_field"} <= keys
+        assert "_sa_instance_state" not in keys
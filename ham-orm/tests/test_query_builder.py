@@ -6,88 +6,75 @@ from unittest.mock import Mock, MagicMock
 from ham_orm import QueryBuilder
 
 
+# Operator coverage table: (id, filter key, value, column attr, column method,
+# expected call args, expected (exception, match) or None for the happy path).
+OPS = [
+    ("eq", "name", "test", "name", "__eq__", ("test",), None),
+    ("ne", "name__ne", "test", "name", "__ne__", ("test",), None),
+    ("in", "name__in", ["test1", "test2"], "name", "in_", (["test1", "test2"],), None),
+    ("between", "age__between", [18, 65], "age", "between", (18, 65), None),
+    ("like", "name__like", "%test%", "name", "like", ("%test%",), None),
+    ("ilike", "name__ilike", "%test%", "name", "ilike", ("%test%",), None),
+    ("invalid-op", "name__invalid", "test", "name", None, None,
+     (ValueError, "Unsupported operator '__invalid'")),
+    ("in-bad-type", "name__in", "not_a_list", "name", None, None,
+     (TypeError, "'name__in' expects a list/tuple/set")),
+    ("between-bad-type", "age__between", [1, 2, 3], "age", None, None,
+     (TypeError, "'age__between' expects a 2-tuple/list")),
+]
+
+
+def pytest_generate_tests(metafunc):
+    """Generate the operator tests from the OPS table at collection time."""
+    if "op_spec" in metafunc.fixturenames:
+        metafunc.parametrize("op_spec", OPS, ids=[o[0] for o in OPS])
+
+
 class TestQueryBuilder:
     """Test QueryBuilder class functionality."""
 
     @pytest.fixture
-    def mock_db_session(self):
-        """Create a mock database session."""
-        session = Mock()
-        session.query = Mock()
-        return session
-
-    @pytest.fixture
-    def mock_model(self):
-        """Create a mock SQLAlchemy model."""
-        model = Mock()
-        model.__name__ = "TestModel"
-        model.id = Mock()
-        model.name = Mock()
-        return model
+    def qb(self, mock_db_session, mock_model):
+        """QueryBuilder wired to the shared mock session/model."""
+        return QueryBuilder(mock_db_session, mock_model)
 
     def test_query_builder_initialization_with_legacy_query(self, mock_db_session, mock_model):
-        """Test QueryBuilder initialization with legacy query support."""
-        qb = QueryBuilder(mock_db_session, mock_model)
+        """Test QueryBuilder initialization with forced legacy query support."""
+        qb = QueryBuilder(mock_db_session, mock_model, use_legacy_query=True)
         assert qb.db == mock_db_session
         assert qb.model == mock_model
         assert qb._use_legacy_query is True
 
     def test_query_builder_initialization_without_legacy_query(self, mock_model):
-        """Test QueryBuilder initialization without legacy query support."""
-        modern_session = Mock()
-        # Remove query attribute to simulate modern SQLAlchemy
-        delattr(modern_session, 'query') if hasattr(modern_session, 'query') else None
-        
+        """Test QueryBuilder defaults to the modern select() path."""
+        # spec=object() means .query was never auto-generated
+        modern_session = Mock(spec=object())
+
         qb = QueryBuilder(modern_session, mock_model)
         assert qb.db == modern_session
         assert qb.model == mock_model
         assert qb._use_legacy_query is False
 
-    def test_include_with_string(self, mock_db_session, mock_model):
-        """Test include method with string relationship name."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.relationship = Mock()
-        
-        result = qb.include("relationship")
-        assert result is qb  # Should return self for chaining
-        assert len(qb._includes) == 1
-
-    def test_only_with_string(self, mock_db_session, mock_model):
-        """Test only method with string column name."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        
-        result = qb.only("name")
-        assert result is qb  # Should return self for chaining
-        assert len(qb._only_cols) == 1
-
-    def test_where_with_filters_dict(self, mock_db_session, mock_model):
+    @pytest.mark.parametrize("method,args,attr,expected_len", [
+        ("include", ("relationship",), "_includes", 1),
+        ("only", ("name",), "_only_cols", 1),
+        ("order_by", ("name",), "_order_by", 1),
+        ("order_by", ("-name",), "_order_by", 1),
+    ])
+    def test_chain_returns_self(self, qb, mock_model, method, args, attr, expected_len):
+        """Each chain method returns self and records its argument."""
+        setattr(mock_model, args[0].lstrip("-"), Mock())
+        assert getattr(qb, method)(*args) is qb
+        assert len(getattr(qb, attr)) == expected_len
+
+    def test_where_with_filters_dict(self, qb, mock_model):
         """Test where method with filters dictionary."""
-        qb = QueryBuilder(mock_db_session, mock_model)
         mock_model.name = Mock()
         mock_model.name.__eq__ = Mock(return_value="name_equals_filter")
         
         result = qb.where({"name": "test"})
         assert result is qb  # Should return self for chaining
 
-    def test_order_by_with_string(self, mock_db_session, mock_model):
-        """Test order_by method with string field name."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        
-        result = qb.order_by("name")
-        assert result is qb  # Should return self for chaining
-        assert len(qb._order_by) == 1
-
-    def test_order_by_with_desc_string(self, mock_db_session, mock_model):
-        """Test order_by method with descending string field name."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        
-        result = qb.order_by("-name")
-        assert result is qb  # Should return self for chaining
-        assert len(qb._order_by) == 1
-
     def test_limit_and_offset(self, mock_db_session, mock_model):
         """Test limit and offset methods."""
         qb = QueryBuilder(mock_db_session, mock_model)
@@ -100,9 +87,8 @@ class TestQueryBuilder:
         assert result_offset is qb
         assert qb._offset == 5
 
-    def test_build_query_method(self, mock_db_session, mock_model):
+    def test_build_query_method(self, qb, mock_model):
         """Test build_query convenience method."""
-        qb = QueryBuilder(mock_db_session, mock_model)
         mock_model.name = Mock()
         mock_model.id = Mock()
         
@@ -117,25 +103,21 @@ class TestQueryBuilder:
         
         assert result is qb
 
-    def test_resolve_attr_existing(self, mock_db_session, mock_model):
+    def test_resolve_attr_existing(self, qb, mock_model):
         """Test _resolve_attr with existing attribute."""
-        qb = QueryBuilder(mock_db_session, mock_model)
         mock_model.name = Mock()
         
         result = qb._resolve_attr(mock_model, "name")
         assert result == mock_model.name
 
-    def test_resolve_attr_nonexistent(self, mock_db_session, mock_model):
+    def test_resolve_attr_nonexistent(self, qb, mock_model):
         """Test _resolve_attr with nonexistent attribute."""
-        qb = QueryBuilder(mock_db_session, mock_model)
         
         with pytest.raises(ValueError, match="TestModel has no attribute 'nonexistent'"):
             qb._resolve_attr(mock_model, "nonexistent")
 
-    def test_normalize_field(self, mock_db_session, mock_model):
+    def test_normalize_field(self, qb):
         """Test _normalize_field method."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        
         # Test with prefixed field
         result = qb._normalize_field("TestModel.name")
         assert result == "name"
@@ -144,93 +126,25 @@ class TestQueryBuilder:
         result = qb._normalize_field("name")
         assert result == "name"
 
-    def test_build_predicates_eq_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with eq operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        mock_model.name.__eq__ = Mock(return_value="name_eq_predicate")
-        
-        predicates = qb._build_predicates({"name": "test"})
-        assert len(predicates) == 1
-        mock_model.name.__eq__.assert_called_once_with("test")
+    def test_build_predicates(self, qb, mock_model, op_spec):
+        """Operator dispatch and validation, generated from the OPS table."""
+        op_id, key, value, attr, method, call_args, error = op_spec
+        column = Mock()
+        setattr(mock_model, attr, column)
 
-    def test_build_predicates_ne_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with ne operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        mock_model.name.__ne__ = Mock(return_value="name_ne_predicate")
-        
-        predicates = qb._build_predicates({"name__ne": "test"})
-        assert len(predicates) == 1
-        mock_model.name.__ne__.assert_called_once_with("test")
-
-    def test_build_predicates_in_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with in operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        mock_model.name.in_ = Mock(return_value="name_in_predicate")
-        
-        predicates = qb._build_predicates({"name__in": ["test1", "test2"]})
-        assert len(predicates) == 1
-        mock_model.name.in_.assert_called_once_with(["test1", "test2"])
-
-    def test_build_predicates_between_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with between operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.age = Mock()
-        mock_model.age.between = Mock(return_value="age_between_predicate")
-        
-        predicates = qb._build_predicates({"age__between": [18, 65]})
-        assert len(predicates) == 1
-        mock_model.age.between.assert_called_once_with(18, 65)
-
-    def test_build_predicates_like_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with like operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        mock_model.name.like = Mock(return_value="name_like_predicate")
-        
-        predicates = qb._build_predicates({"name__like": "%test%"})
-        assert len(predicates) == 1
-        mock_model.name.like.assert_called_once_with("%test%")
+        if error is not None:
+            exc, match = error
+            with pytest.raises(exc, match=match):
+                qb._build_predicates({key: value})
+            return
 
-    def test_build_predicates_ilike_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with ilike operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        mock_model.name.ilike = Mock(return_value="name_ilike_predicate")
-        
-        predicates = qb._build_predicates({"name__ilike": "%test%"})
+        setattr(column, method, Mock(return_value=f"{op_id}_predicate"))
+        predicates = qb._build_predicates({key: value})
         assert len(predicates) == 1
-        mock_model.name.ilike.assert_called_once_with("%test%")
-
-    def test_build_predicates_invalid_operator(self, mock_db_session, mock_model):
-        """Test _build_predicates with invalid operator."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        
-        with pytest.raises(ValueError, match="Unsupported operator '__invalid'"):
-            qb._build_predicates({"name__invalid": "test"})
+        getattr(column, method).assert_called_once_with(*call_args)
 
-    def test_build_predicates_in_operator_invalid_type(self, mock_db_session, mock_model):
-        """Test _build_predicates with in operator and invalid value type."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.name = Mock()
-        
-        with pytest.raises(TypeError, match="'name__in' expects a list/tuple/set"):
-            qb._build_predicates({"name__in": "not_a_list"})
-
-    def test_build_predicates_between_operator_invalid_type(self, mock_db_session, mock_model):
-        """Test _build_predicates with between operator and invalid value type."""
-        qb = QueryBuilder(mock_db_session, mock_model)
-        mock_model.age = Mock()
-        
-        with pytest.raises(TypeError, match="'age__between' expects a 2-tuple/list"):
-            qb._build_predicates({"age__between": [1, 2, 3]})  # Too many values
-
-    def test_exists_method(self, mock_db_session, mock_model):
+    def test_exists_method(self, qb):
         """Test exists method."""
-        qb = QueryBuilder(mock_db_session, mock_model)
         qb.first = Mock(return_value="some_result")
         
         result = qb.exists()